@@ -0,0 +1,66 @@
+"""
+Benchmark: cost of per-type anomaly detection relative to ingest.
+
+Writes a synthetic equipment CSV, then times the ingest work that does not
+touch the database (core.ingest.parse_equipment_csv, as uploads parse, + the
+upload statistics, which include the type factorization shared with the
+detector) and flag_anomalies() on the same DataFrame. The database insert is left out of the baseline, so the
+reported ratio is an upper bound of what detection adds to a real upload.
+
+Usage (from backend/):
+    python benchmarks/bench_anomalies.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.analytics import factorize_types, type_distribution, flag_anomalies  # noqa: E402
+from core.ingest import parse_equipment_csv  # noqa: E402
+from datagen import write_equipment_csv  # noqa: E402
+
+MAX_OVERHEAD = 0.10
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'equipment.csv')
+        write_equipment_csv(path, args.rows)
+
+        def ingest():
+            df, _, _ = parse_equipment_csv(path)
+            df['Flowrate'].mean(), df['Pressure'].mean(), df['Temperature'].mean()
+            codes, types = factorize_types(df)
+            type_distribution(codes, types)
+            return df, codes, types
+
+        ingest_time, (df, codes, types) = best_of(args.repeat, ingest)
+        detect_time, (_, _, flags) = best_of(args.repeat, lambda: flag_anomalies(df, codes, len(types)))
+
+    overhead = detect_time / ingest_time
+    print(f"rows:               {args.rows:,}")
+    print(f"parse + statistics: {ingest_time:.3f} s")
+    print(f"flag_anomalies:     {detect_time:.3f} s ({int(flags.sum()):,} flagged)")
+    print(f"overhead:           {overhead:.1%} (budget {MAX_OVERHEAD:.0%})")
+    return 0 if overhead < MAX_OVERHEAD else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Benchmark: typed ingest parser vs. the untyped pd.read_csv call it replaced.
+
+Writes a synthetic equipment CSV (with an extra unused column, as real exports
+have) and times:
+  * pd.read_csv(path)            - default engine, dtype inference on every column
+  * parse_equipment_csv(path)    - usecols + fixed dtypes + pyarrow engine if installed
+  * parse_equipment_csv(path)    - same file with a few non-numeric cells (slow path)
+
+Usage (from backend/):
+    python benchmarks/bench_parse.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ingest import parse_equipment_csv, CSV_ENGINE  # noqa: E402
+from datagen import write_equipment_csv  # noqa: E402
+
+BAD_CELLS = 10
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clean = os.path.join(tmp, 'clean.csv')
+        dirty = os.path.join(tmp, 'dirty.csv')
+        write_equipment_csv(clean, args.rows, extra_columns=True)
+        write_equipment_csv(dirty, args.rows, extra_columns=True, bad_cells=BAD_CELLS)
+
+        # The dirty file must go through the text re-read (slow path), not count as missing values
+        _, rejected, errors = parse_equipment_csv(dirty)
+        if rejected != BAD_CELLS or any(e['error'] != 'not a number' for e in errors):
+            sys.exit(f"dirty file not parsed on the slow path: {rejected} rejected, {errors[:3]}")
+
+        baseline = best_of(args.repeat, lambda: pd.read_csv(clean))
+        typed = best_of(args.repeat, lambda: parse_equipment_csv(clean))
+        typed_dirty = best_of(args.repeat, lambda: parse_equipment_csv(dirty))
+
+    print(f"rows:                         {args.rows:,}")
+    print(f"pd.read_csv (default):        {baseline:.3f} s")
+    print(f"{'parse_equipment_csv (' + CSV_ENGINE + '):':<30}{typed:.3f} s ({baseline / typed:.1f}x)")
+    print(f"{f'  with {BAD_CELLS} bad cells:':<30}{typed_dirty:.3f} s ({baseline / typed_dirty:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Fixtures for the API benchmarks: synthetic CSVs from datagen, an authenticated
+client, and uploaded batches. Uploaded files go to a temporary MEDIA_ROOT.
+
+Sizes default to 1k and 10k rows; pick others with --bench-rows, e.g.
+    python -m pytest benchmarks --bench-rows 1000,100000
+(baselines are matched by test name, so only sizes that were saved are compared).
+"""
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.utils import get_machine_id
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from datagen import write_equipment_csv
+
+HISTORY_SIZE = 5  # batches listed by GET /api/upload/
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-rows', default='1000,10000',
+                     help='comma-separated CSV sizes to benchmark (default: 1000,10000)')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Baselines live next to this file whatever the working directory; they are per
+    # machine type, and without one the suite runs without the regression gate
+    storage = config.getoption('benchmark_storage')
+    if storage.startswith('file://'):
+        storage_dir = config.rootpath / storage[len('file://'):]
+        config.option.benchmark_storage = f'file://{storage_dir}'
+        baselines = storage_dir / get_machine_id()
+        if not any(baselines.glob('*.json')):
+            config.option.benchmark_compare = None
+            config.option.benchmark_compare_fail = None
+            print(f"benchmarks: no baseline in {baselines}, not checking for regressions "
+                  "(save one with --benchmark-save=baseline)")
+
+
+def pytest_generate_tests(metafunc):
+    if 'rows' in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption('--bench-rows').split(',')]
+        metafunc.parametrize('rows', sizes, ids=[f'{size}rows' for size in sizes], scope='session')
+
+
+@pytest.fixture(scope='session')
+def equipment_csv(rows, tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / f'equipment_{rows}.csv'
+    write_equipment_csv(path, rows)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def client(db):
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user('bench', password='bench-password'))
+    return client
+
+
+def upload(client, path):
+    with open(path, 'rb') as f:
+        response = client.post('/api/upload/', {'file': f}, format='multipart')
+    assert response.status_code == 201, response.data
+    return response
+
+
+@pytest.fixture
+def batches(client, equipment_csv):
+    """Ids of a full upload history, newest last."""
+    return [upload(client, equipment_csv).data['batch_id'] for _ in range(HISTORY_SIZE)]
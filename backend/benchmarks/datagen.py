@@ -0,0 +1,125 @@
+"""
+Deterministic synthetic equipment data for benchmarks.
+
+Rows follow the shape of sample_equipment_data.csv: each equipment type has its
+own typical flowrate / pressure / temperature, readings scatter normally around
+it, type frequencies have a long tail, and a small share of rows are outliers.
+The same (rows, types, seed) always produces the same file, byte for byte.
+Large files are generated and written in chunks, so 10M rows fit in memory.
+
+Usage (from backend/):
+    python benchmarks/datagen.py --rows 1000000 --types 12 -o /tmp/equipment.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Type -> (flowrate m3/h, pressure bar, temperature C) means, from the sample data
+BASE_TYPES = {
+    'Pump': (126.0, 5.5, 115.0),
+    'Compressor': (97.0, 8.2, 96.0),
+    'Valve': (60.0, 4.1, 105.0),
+    'HeatExchanger': (152.0, 6.2, 131.0),
+    'Reactor': (142.0, 7.4, 139.0),
+    'Condenser': (162.0, 6.8, 126.0),
+}
+
+# Relative spread of each reading around its type's mean
+RELATIVE_STD = (0.04, 0.04, 0.025)
+
+# Share of rows whose pressure or temperature is pushed far from the type's mean
+OUTLIER_FRACTION = 0.001
+
+CHUNK_ROWS = 1_000_000
+
+
+def type_profiles(n_types, seed=0):
+    """(names, means, weights) for `n_types` types; extra types beyond the six base ones get random means."""
+    rng = np.random.default_rng([seed, n_types])
+    names = list(BASE_TYPES)[:n_types]
+    means = [BASE_TYPES[name] for name in names]
+    for i in range(len(names), n_types):
+        names.append(f'Unit{i + 1:03d}')
+        means.append((rng.uniform(40, 200), rng.uniform(2, 12), rng.uniform(60, 180)))
+    # Long tail: the k-th type is about k^-0.8 as common as the first
+    weights = 1.0 / np.arange(1, n_types + 1) ** 0.8
+    return names, np.array(means), weights / weights.sum()
+
+
+def generate_chunks(rows, n_types=6, seed=0, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames with the five equipment columns, `chunk_rows` at a time."""
+    names, means, weights = type_profiles(n_types, seed)
+    std = means * RELATIVE_STD
+    per_type_count = np.zeros(n_types, dtype=np.int64)
+
+    for chunk, start in enumerate(range(0, rows, chunk_rows)):
+        size = min(chunk_rows, rows - start)
+        rng = np.random.default_rng([seed, n_types, chunk])
+
+        codes = rng.choice(n_types, size=size, p=weights)
+        readings = rng.normal(means[codes], std[codes])
+
+        outliers = np.flatnonzero(rng.random(size) < OUTLIER_FRACTION)
+        column = rng.integers(1, 3, size=len(outliers))  # pressure or temperature
+        direction = rng.choice([-1.0, 1.0], size=len(outliers))
+        readings[outliers, column] += direction * 8 * std[codes[outliers], column]
+
+        # "Pump-1", "Pump-2", ... numbered per type, continuing across chunks
+        numbers = pd.Series(codes).groupby(codes).cumcount().to_numpy() + per_type_count[codes] + 1
+        per_type_count += np.bincount(codes, minlength=n_types)
+
+        type_names = np.array(names, dtype=object)[codes]
+        yield pd.DataFrame({
+            'Equipment Name': pd.Series(type_names).str.cat(numbers.astype(str), sep='-'),
+            'Type': type_names,
+            'Flowrate': readings[:, 0].round(1),
+            'Pressure': readings[:, 1].round(2),
+            'Temperature': readings[:, 2].round(1),
+        })
+
+
+def generate_equipment(rows, n_types=6, seed=0):
+    """All `rows` rows as one DataFrame (for small sizes; use write_equipment_csv for big files)."""
+    return pd.concat(generate_chunks(rows, n_types, seed), ignore_index=True)
+
+
+def write_equipment_csv(path, rows, n_types=6, seed=0, extra_columns=False, bad_cells=0):
+    """
+    Write `rows` rows of synthetic equipment data to `path`.
+    `extra_columns` adds an unused free-text column, as real exports have;
+    `bad_cells` replaces that many pressure readings with 'bad' (not a number, and
+    not a token pandas reads as missing, so the parser's text re-read path runs).
+    """
+    rng = np.random.default_rng([seed, n_types, rows])
+    bad = np.sort(rng.choice(rows, size=bad_cells, replace=False)) if bad_cells else np.array([], dtype=np.int64)
+
+    with open(path, 'w', newline='') as f:
+        start = 0
+        for i, df in enumerate(generate_chunks(rows, n_types, seed)):
+            if extra_columns:
+                df['Site Notes'] = rng.choice(['ok', 'checked', 'replaced seal'], size=len(df))
+            chunk_bad = bad[(bad >= start) & (bad < start + len(df))] - start
+            if len(chunk_bad):
+                df['Pressure'] = df['Pressure'].astype(object)
+                df.loc[chunk_bad, 'Pressure'] = 'bad'
+            df.to_csv(f, index=False, header=(i == 0))
+            start += len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--types', type=int, default=6, help='number of equipment types (default 6)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--extra-columns', action='store_true', help='add an unused "Site Notes" column')
+    parser.add_argument('--bad-cells', type=int, default=0, help="pressure cells to replace with 'bad'")
+    parser.add_argument('-o', '--output', required=True)
+    args = parser.parse_args()
+
+    write_equipment_csv(args.output, args.rows, args.types, args.seed, args.extra_columns, args.bad_cells)
+    print(f"wrote {args.rows:,} rows ({args.types} types) to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+"""
+Local load test: starts the app under gunicorn with the production settings
+(gunicorn.conf.py, DEBUG off) on a throwaway SQLite database, drives it with
+concurrent virtual users and reports throughput, p50/p95/p99 latency and error
+rate per endpoint. Needs nothing but the backend's own dependencies.
+
+Each virtual user logs in, then loops over a weighted mix of actions with an
+exponential think time between them:
+    history poll   GET  /api/upload/
+    batch stats    GET  /api/batch/<id>/       (a batch from the last poll)
+    upload         POST /api/upload/           (a datagen CSV of --rows rows)
+    pdf export     GET  /api/export-pdf/<id>/
+    login          POST /api/login/
+Requests authenticate with HTTP Basic auth, as the desktop client does.
+
+Usage (from backend/):
+    python benchmarks/loadtest.py --users 50 --duration 60 --workers 4
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from datagen import write_equipment_csv
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Action -> relative weight in the traffic mix
+MIX = {
+    'history poll': 50,
+    'batch stats': 30,
+    'upload': 5,
+    'pdf export': 10,
+    'login': 5,
+}
+
+PASSWORD = 'loadtest-password'
+METRICS_TOKEN = 'loadtest-metrics'
+
+SETTINGS_TEMPLATE = """\
+from config.settings import *  # noqa: F401,F403
+
+DATABASES['default']['NAME'] = {db!r}
+MEDIA_ROOT = {media!r}
+PROFILES_DIR = Path({media!r}) / 'profiles'
+"""
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Server:
+    """gunicorn serving the app from a temporary database and media directory."""
+
+    def __init__(self, workdir, workers, threads, users, env=None, extra_settings=''):
+        self.workdir = workdir
+        self.port = free_port()
+        with open(os.path.join(workdir, 'loadtest_settings.py'), 'w') as f:
+            f.write(SETTINGS_TEMPLATE.format(db=os.path.join(workdir, 'db.sqlite3'),
+                                             media=os.path.join(workdir, 'media')) + extra_settings)
+        self.env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join([workdir, BACKEND_DIR]),
+            DJANGO_SETTINGS_MODULE='loadtest_settings',
+            RENDER='1',  # production mode: DEBUG off
+            PORT=str(self.port),
+            WEB_CONCURRENCY=str(workers),
+            GUNICORN_THREADS=str(threads),
+            GUNICORN_ACCESS_LOG='',
+            METRICS_TOKEN=METRICS_TOKEN,
+            **(env or {}),
+        )
+        self.usernames = [f'loaduser{i}' for i in range(users)]
+        self.process = None
+
+    def manage(self, *args, stdin=None):
+        result = subprocess.run([sys.executable, 'manage.py', *args], cwd=BACKEND_DIR, env=self.env,
+                                input=stdin, text=True, capture_output=True)
+        if result.returncode:
+            raise RuntimeError(f"manage.py {args[0]} failed:\n{result.stderr}")
+
+    def prepare(self):
+        self.manage('migrate', '--no-input')
+        # One password hash shared by every user keeps setup fast
+        self.manage('shell', stdin=(
+            "from django.contrib.auth.hashers import make_password\n"
+            "from django.contrib.auth.models import User\n"
+            f"password = make_password({PASSWORD!r})\n"
+            f"User.objects.bulk_create([User(username=u, password=password) for u in {self.usernames!r}])\n"
+        ))
+
+    def start(self, timeout=60):
+        self.log = open(os.path.join(self.workdir, 'gunicorn.log'), 'w')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'config.wsgi:application',
+             '--bind', f'127.0.0.1:{self.port}'],
+            cwd=BACKEND_DIR, env=self.env, stdout=self.log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with {self.process.returncode}, see {self.log.name}")
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+                conn.request('GET', '/metrics', headers={'Authorization': f'Bearer {METRICS_TOKEN}'})
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"gunicorn did not answer within {timeout}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.process:
+            self.log.close()
+
+
+class Stats:
+    """Latencies and errors per action, shared by all virtual users."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = {}
+
+    def record(self, action, seconds, error=None):
+        with self.lock:
+            self.latencies[action].append(seconds)
+            if error:
+                self.errors[action] += 1
+                self.error_samples.setdefault(action, error)
+
+    def report(self, duration):
+        rows = []
+        for action in list(MIX) + ['total']:
+            if action == 'total':
+                latencies = sorted(l for values in self.latencies.values() for l in values)
+                errors = sum(self.errors.values())
+            else:
+                latencies = sorted(self.latencies[action])
+                errors = self.errors[action]
+            if not latencies:
+                continue
+            rows.append({
+                "endpoint": action,
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / duration, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+                "max_ms": round(latencies[-1] * 1000, 1),
+                "errors": errors,
+                "error_rate": round(errors / len(latencies), 4),
+            })
+        return rows
+
+
+class VirtualUser(threading.Thread):
+
+    def __init__(self, port, username, csv_path, stats, stop_at, think_time, seed, mix=MIX, history_limit=0):
+        super().__init__(daemon=True)
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+        self.username = username
+        credentials = base64.b64encode(f'{username}:{PASSWORD}'.encode()).decode()
+        self.auth = {'Authorization': f'Basic {credentials}'}
+        self.csv_path = csv_path
+        self.stats = stats
+        self.stop_at = stop_at
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.mix = mix
+        # The server's UPLOAD_HISTORY_LIMIT: each upload prunes this user's batches past it
+        self.history_limit = history_limit
+        self.batch_ids = []  # newest first, as the server lists them
+
+    def request(self, action, method, path, body=None, headers=None):
+        start = time.perf_counter()
+        for attempt in range(2):
+            # A kept-alive connection may have been closed by the server while this user
+            # was thinking; retry once on a fresh one, as HTTP client libraries do
+            reused = self.conn.sock is not None
+            try:
+                self.conn.request(method, path, body=body, headers={**self.auth, **(headers or {})})
+                response = self.conn.getresponse()
+                payload = response.read()
+                break
+            except (OSError, http.client.HTTPException) as exc:
+                self.conn.close()
+                stale = isinstance(exc, (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError))
+                if not (reused and stale and attempt == 0):
+                    self.stats.record(action, time.perf_counter() - start, f"{type(exc).__name__}: {exc}")
+                    return None, None
+        error = f"HTTP {response.status}: {payload[:200]!r}" if response.status >= 400 else None
+        self.stats.record(action, time.perf_counter() - start, error)
+        return response.status, payload
+
+    def login(self):
+        body = json.dumps({'username': self.username, 'password': PASSWORD})
+        self.request('login', 'POST', '/api/login/', body, {'Content-Type': 'application/json'})
+
+    def history_poll(self):
+        status, payload = self.request('history poll', 'GET', '/api/upload/')
+        if status == 200:
+            self.batch_ids = [item['id'] for item in json.loads(payload)]
+
+    def upload(self):
+        boundary = uuid.uuid4().hex
+        with open(self.csv_path, 'rb') as f:
+            content = f.read()
+        body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="equipment.csv"\r\n'
+                f'Content-Type: text/csv\r\n\r\n').encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+        status, payload = self.request('upload', 'POST', '/api/upload/', body,
+                                       {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+        if status == 201:
+            self.batch_ids.insert(0, json.loads(payload)['batch_id'])
+            if self.history_limit:
+                # Forget the batches the upload pruned, so stats requests don't hit 404s
+                del self.batch_ids[self.history_limit:]
+
+    def batch_stats(self):
+        self.request('batch stats', 'GET', f'/api/batch/{self.random.choice(self.batch_ids)}/')
+
+    def pdf_export(self):
+        self.request('pdf export', 'GET', f'/api/export-pdf/{self.random.choice(self.batch_ids)}/')
+
+    def run(self):
+        actions = {
+            'history poll': self.history_poll,
+            'batch stats': self.batch_stats,
+            'upload': self.upload,
+            'pdf export': self.pdf_export,
+            'login': self.login,
+        }
+        names, weights = list(self.mix), list(self.mix.values())
+        self.login()
+        self.history_poll()
+        while time.monotonic() < self.stop_at:
+            action = self.random.choices(names, weights)[0]
+            if action in ('batch stats', 'pdf export') and not self.batch_ids:
+                action = 'upload'
+            actions[action]()
+            time.sleep(min(self.random.expovariate(1 / self.think_time), max(0, self.stop_at - time.monotonic())))
+        self.conn.close()
+
+
+def print_report(rows, args, duration):
+    print(f"\n{args.users} users, {args.workers} workers x {args.threads} threads, "
+          f"{duration:.0f} s, uploads of {args.rows:,} rows\n")
+    header = f"{'endpoint':<14}{'requests':>9}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}{'err %':>8}"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        print(f"{row['endpoint']:<14}{row['requests']:>9}{row['throughput_rps']:>9.1f}{row['p50_ms']:>10.1f}"
+              f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}{row['errors']:>8}"
+              f"{row['error_rate']:>8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20, help='concurrent virtual users (default 20)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load after ramp-up (default 30)')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which users start (default 5)')
+    parser.add_argument('--think-time', type=float, default=1.0, help='mean pause between actions, s (default 1)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes (default 2)')
+    parser.add_argument('--threads', type=int, default=1, help='threads per gunicorn worker (default 1)')
+    parser.add_argument('--rows', type=int, default=1000, help='rows per uploaded CSV (default 1000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='loadtest-') as workdir:
+        csv_path = os.path.join(workdir, 'equipment.csv')
+        write_equipment_csv(csv_path, args.rows, seed=args.seed)
+
+        server = Server(workdir, args.workers, args.threads, args.users)
+        print("preparing database...", flush=True)
+        server.prepare()
+        print(f"starting gunicorn on port {server.port}...", flush=True)
+        server.start()
+        try:
+            stats = Stats()
+            start = time.monotonic()
+            stop_at = start + args.ramp_up + args.duration
+            users = [VirtualUser(server.port, username, csv_path, stats, stop_at, args.think_time, args.seed + i)
+                     for i, username in enumerate(server.usernames)]
+            print(f"running {args.users} users for {args.ramp_up + args.duration:.0f} s...", flush=True)
+            for i, user in enumerate(users):
+                user.start()
+                time.sleep(args.ramp_up / len(users))
+            for user in users:
+                user.join()
+            duration = time.monotonic() - start
+        finally:
+            server.stop()
+
+    rows = stats.report(duration)
+    print_report(rows, args, duration)
+    for action, sample in stats.error_samples.items():
+        print(f"first {action} error: {sample}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"config": vars(args), "duration_seconds": round(duration, 2), "endpoints": rows}, f, indent=2)
+    return 1 if any(row['errors'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
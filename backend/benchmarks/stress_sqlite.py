@@ -0,0 +1,102 @@
+"""
+SQLite concurrency stress test: several gunicorn worker processes serving
+simultaneous uploads (bulk insert + history pruning) while other users keep
+reading batch statistics and polling their history, all on one SQLite file.
+
+Passes (exit code 0) only if no request failed; "database is locked" errors
+are counted separately, from the responses and from the server log.
+
+Usage (from backend/):
+    python benchmarks/stress_sqlite.py --users 16 --workers 4 --duration 60 --rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from datagen import write_equipment_csv
+from loadtest import Server, Stats, VirtualUser, print_report
+
+# Upload-heavy: every user uploads about a third of the time, with no pause
+MIX = {
+    'upload': 35,
+    'history poll': 30,
+    'batch stats': 35,
+}
+
+LOCK_ERROR = 'database is locked'
+
+# Every request authenticates; the production password hasher would make the
+# test CPU-bound on hashing instead of contending for the database
+FAST_HASHER = "PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']\n"
+
+
+class LockStats(Stats):
+    """Stats that also count the failures caused by SQLite lock contention."""
+
+    def __init__(self):
+        super().__init__()
+        self.lock_errors = 0
+
+    def record(self, action, seconds, error=None):
+        super().record(action, seconds, error)
+        if error and LOCK_ERROR in error:
+            with self.lock:
+                self.lock_errors += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=12, help='concurrent virtual users (default 12)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of load (default 30)')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes (default 4)')
+    parser.add_argument('--threads', type=int, default=1, help='threads per gunicorn worker (default 1)')
+    parser.add_argument('--rows', type=int, default=20000, help='rows per uploaded CSV (default 20000)')
+    parser.add_argument('--history-limit', type=int, default=3,
+                        help='UPLOAD_HISTORY_LIMIT, so uploads also prune (default 3)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    args.ramp_up, args.think_time = 0, 0.01
+
+    with tempfile.TemporaryDirectory(prefix='stress-') as workdir:
+        csv_path = os.path.join(workdir, 'equipment.csv')
+        write_equipment_csv(csv_path, args.rows, seed=args.seed)
+
+        server = Server(workdir, args.workers, args.threads, args.users,
+                        env={'UPLOAD_HISTORY_LIMIT': str(args.history_limit)},
+                        extra_settings=FAST_HASHER)
+        print("preparing database...", flush=True)
+        server.prepare()
+        print(f"starting gunicorn on port {server.port}...", flush=True)
+        server.start()
+        try:
+            stats = LockStats()
+            start = time.monotonic()
+            stop_at = start + args.duration
+            users = [VirtualUser(server.port, username, csv_path, stats, stop_at, args.think_time,
+                                 args.seed + i, mix=MIX, history_limit=args.history_limit)
+                     for i, username in enumerate(server.usernames)]
+            print(f"running {args.users} users for {args.duration:.0f} s...", flush=True)
+            for user in users:
+                user.start()
+            for user in users:
+                user.join()
+            duration = time.monotonic() - start
+        finally:
+            server.stop()
+        with open(os.path.join(workdir, 'gunicorn.log')) as f:
+            logged_lock_errors = f.read().count(LOCK_ERROR)
+
+    rows = stats.report(duration)
+    print_report(rows, args, duration)
+    for action, sample in stats.error_samples.items():
+        print(f"first {action} error: {sample}")
+    print(f"\n'{LOCK_ERROR}': {stats.lock_errors} responses, {logged_lock_errors} in the server log")
+    failed = any(row['errors'] for row in rows) or logged_lock_errors
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
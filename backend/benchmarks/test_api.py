@@ -0,0 +1,28 @@
+"""
+End-to-end timings of the main API paths through the Django test client:
+upload, batch statistics, history listing and PDF export.
+"""
+from conftest import upload
+
+
+def test_upload(benchmark, client, equipment_csv):
+    # Each round is a real upload (parse, analysis, insert, pruning), so no warm-up loop
+    response = benchmark.pedantic(upload, args=(client, equipment_csv), rounds=5, warmup_rounds=1)
+    assert response.data['statistics']['total_count'] > 0
+
+
+def test_batch_statistics(benchmark, client, batches):
+    response = benchmark(client.get, f'/api/batch/{batches[-1]}/')
+    assert response.status_code == 200
+
+
+def test_history_listing(benchmark, client, batches):
+    response = benchmark(client.get, '/api/upload/')
+    assert response.status_code == 200
+    assert len(response.data) == len(batches)
+
+
+def test_pdf_export(benchmark, client, batches):
+    response = benchmark.pedantic(client.get, args=(f'/api/export-pdf/{batches[-1]}/',), rounds=10, warmup_rounds=1)
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/pdf'
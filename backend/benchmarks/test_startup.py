@@ -0,0 +1,45 @@
+"""
+Cold start: a fresh interpreter loading the WSGI application and the URLconf,
+which is what a gunicorn worker (or a scaled-to-zero instance) does before its
+first request. pandas and ReportLab are left out of that path and loaded by the
+first upload or PDF export; their own import time is measured separately.
+"""
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use only (gunicorn.conf.py can preload them)
+LAZY_MODULES = ['numpy', 'pandas', 'pyarrow', 'reportlab']
+
+LOAD_APP = f"""
+import json, sys
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+import config.urls
+print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))
+"""
+
+LOAD_LAZY_MODULES = """
+import core.analytics, core.ingest, reportlab.platypus
+print('[]')
+"""
+
+
+def run_python(code):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def test_cold_start(benchmark):
+    loaded = benchmark.pedantic(run_python, args=(LOAD_APP,), rounds=10, warmup_rounds=1)
+    assert loaded == [], "imported at startup; import them where they are used"
+
+
+def test_lazy_imports(benchmark):
+    # What the first upload / PDF export of a worker pays on top of the cold start
+    benchmark.pedantic(run_python, args=(LOAD_LAZY_MODULES,), rounds=10, warmup_rounds=1)
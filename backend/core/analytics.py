@@ -0,0 +1,120 @@
+"""
+Vectorized analytics run on the ingest DataFrame.
+Everything here works on whole columns with NumPy, no per-row Python.
+"""
+import numpy as np
+import pandas as pd
+
+from .thresholds import ANOMALY_ZSCORE_THRESHOLD
+
+
+def group_zscores(values, codes, n_groups, counts=None):
+    """
+    Z-score of every value within its group.
+    `codes` holds the group index of each row (0..n_groups-1), as produced by pd.factorize;
+    `counts` (rows per group, np.bincount(codes)) can be passed when already computed.
+    Groups with fewer than two rows or no spread get a z-score of 0.
+    """
+    if counts is None:
+        counts = np.bincount(codes, minlength=n_groups)
+    means = np.bincount(codes, weights=values, minlength=n_groups) / np.maximum(counts, 1)
+
+    # Two-pass variance: numerically safer than E[x²] - E[x]²
+    deviations = values - means[codes]
+    squares = np.bincount(codes, weights=deviations * deviations, minlength=n_groups)
+    stds = np.sqrt(squares / np.maximum(counts - 1, 1))
+
+    # Scale by 1/std per group (0 where there is no spread): one gather and an
+    # in-place multiply instead of gathering the stds and a masked divide per row
+    inverse_stds = np.divide(1.0, stds, out=np.zeros_like(stds), where=stds > 0)
+    deviations *= inverse_stds[codes]
+    return deviations
+
+
+def factorize_types(df):
+    """
+    Integer code of every row's equipment type, plus the distinct types.
+    Computed once per upload and shared by the statistics and the anomaly check.
+    """
+    return pd.factorize(df['Type'], use_na_sentinel=False)
+
+
+def type_distribution(codes, types):
+    """Count of each equipment type, most common first (same order as value_counts)."""
+    counts = np.bincount(codes, minlength=len(types))
+    order = np.argsort(-counts, kind='stable')
+    return {str(types[i]): int(counts[i]) for i in order}
+
+
+def flag_anomalies(df, codes, n_groups, threshold=ANOMALY_ZSCORE_THRESHOLD):
+    """
+    Flag rows whose pressure or temperature is far from their type's distribution.
+    `codes`/`n_groups` come from factorize_types(df).
+    Returns (pressure_zscores, temperature_zscores, is_anomaly) as NumPy arrays
+    aligned with the rows of `df`.
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    pressure_z = group_zscores(df['Pressure'].to_numpy(dtype=np.float64), codes, n_groups, counts)
+    temperature_z = group_zscores(df['Temperature'].to_numpy(dtype=np.float64), codes, n_groups, counts)
+
+    is_anomaly = (np.abs(pressure_z) > threshold) | (np.abs(temperature_z) > threshold)
+    return pressure_z, temperature_z, is_anomaly
+
+
+# Rule field -> ingest DataFrame column
+RULE_COLUMNS = {'flowrate': 'Flowrate', 'pressure': 'Pressure', 'temperature': 'Temperature'}
+
+# Rows per evaluation chunk: bounds the (rows x rules) mask in memory
+RULE_CHUNK_ROWS = 65536
+
+
+def evaluate_rules(df, rules, codes, types, sample_size=10):
+    """
+    Evaluate all threshold rules against the ingest DataFrame in a single pass over the rows.
+    Rules are compiled into arrays (column, threshold, wanted comparison sign, type code)
+    and every chunk of rows is compared against all of them at once by broadcasting,
+    so adding rules widens the mask instead of adding passes.
+    `codes`/`types` come from factorize_types(df).
+    Returns a list of (rule, violation_count, sample_equipment_names), one per rule.
+    """
+    if not rules or df.empty:
+        return [(rule, 0, []) for rule in rules]
+
+    fields = list(RULE_COLUMNS)
+    values = np.column_stack([df[RULE_COLUMNS[f]].to_numpy(dtype=np.float64) for f in fields])
+    names = df['Equipment Name'].to_numpy()
+
+    # Compile the rules
+    type_index = {str(name): i for i, name in enumerate(types)}
+    rule_columns = np.array([fields.index(rule.field) for rule in rules])
+    thresholds = np.array([rule.threshold for rule in rules], dtype=np.float64)
+    want_gt = np.array([rule.operator in ('>', '>=') for rule in rules])
+    want_eq = np.array([rule.operator in ('>=', '<=') for rule in rules])
+    want_lt = np.array([rule.operator in ('<', '<=') for rule in rules])
+    # -1: any type, -2: type absent from this batch (never matches)
+    rule_types = np.array([
+        type_index.get(rule.equipment_type, -2) if rule.equipment_type else -1
+        for rule in rules
+    ])
+    any_type = rule_types == -1
+
+    counts = np.zeros(len(rules), dtype=np.int64)
+    samples = [[] for _ in rules]
+
+    for start in range(0, len(df), RULE_CHUNK_ROWS):
+        stop = start + RULE_CHUNK_ROWS
+        diff = values[start:stop][:, rule_columns] - thresholds  # (chunk, rules)
+        mask = ((diff > 0) & want_gt) | ((diff == 0) & want_eq) | ((diff < 0) & want_lt)
+        mask &= any_type | (codes[start:stop, None] == rule_types)
+
+        chunk_counts = mask.sum(axis=0)
+        counts += chunk_counts
+
+        # Collect example rows only for rules that matched here and still need some
+        for r in np.flatnonzero(chunk_counts):
+            missing = sample_size - len(samples[r])
+            if missing > 0:
+                rows = np.flatnonzero(mask[:, r])[:missing] + start
+                samples[r].extend(str(name) for name in names[rows])
+
+    return [(rule, int(count), sample) for rule, count, sample in zip(rules, counts, samples)]
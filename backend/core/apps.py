@@ -2,4 +2,6 @@ from django.apps import AppConfig
 
 
 class CoreConfig(AppConfig):
+    # The migrations create bigint ids; keep the models (and their FKs) in step
+    default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
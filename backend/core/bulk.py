@@ -0,0 +1,118 @@
+"""
+Bulk insert of a parsed upload into ChemicalEquipment.
+On PostgreSQL (psycopg 3) the rows are streamed with COPY FROM STDIN in binary
+format: one statement, no SQL per row and no parameter limit. Other backends
+(SQLite) go through bulk_create, which splits the rows into INSERT batches, in
+transactions of INGEST_ROWS_PER_TRANSACTION rows taken under the ingest lock.
+"""
+from itertools import repeat
+
+from django.conf import settings
+from django.db import connections
+
+from .locks import ingest_step
+from .models import ChemicalEquipment
+
+# Columns written at ingest, in COPY order (the id comes from the sequence)
+INSERT_FIELDS = [
+    'batch', 'equipment_name', 'equipment_type', 'flowrate', 'pressure', 'temperature',
+    'pressure_zscore', 'temperature_zscore', 'is_anomaly',
+]
+
+
+def supports_copy(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return is_psycopg3
+
+
+def insert_equipment(batch, df, pressure_z, temperature_z, is_anomaly, using='default', method=None):
+    """
+    Store the rows of `df` (canonical columns) with their anomaly flags under `batch`.
+    `method` forces 'copy' or 'bulk_create'; by default COPY is used when the backend supports it.
+    Returns counters describing the insert, for the ingest performance report.
+    """
+    connection = connections[using]
+    method = method or ('copy' if supports_copy(connection) else 'bulk_create')
+
+    # Plain Python lists, zipped row-wise below (much cheaper than iterating the DataFrame)
+    columns = [
+        df['Equipment Name'].tolist(),
+        df['Type'].tolist(),
+        df['Flowrate'].tolist(),
+        df['Pressure'].tolist(),
+        df['Temperature'].tolist(),
+        pressure_z.tolist(),
+        temperature_z.tolist(),
+        is_anomaly.tolist(),
+    ]
+
+    if method == 'copy':
+        copy_rows(connection, batch.id, columns)
+        return {"insert_method": "copy"}
+
+    equipment_list = [
+        ChemicalEquipment(
+            batch=batch,
+            equipment_name=name,
+            equipment_type=equipment_type,
+            flowrate=flowrate,
+            pressure=pressure,
+            temperature=temperature,
+            pressure_zscore=p_z,
+            temperature_zscore=t_z,
+            is_anomaly=flagged
+        )
+        for name, equipment_type, flowrate, pressure, temperature, p_z, t_z, flagged in zip(*columns)
+    ]
+    # The backend caps the rows per INSERT (SQLite: 999 parameters), record what it used
+    insert_fields = [f for f in ChemicalEquipment._meta.concrete_fields if not f.primary_key]
+    rows_per_insert = connection.ops.bulk_batch_size(insert_fields, equipment_list) or len(equipment_list)
+    rows_per_transaction = settings.INGEST_ROWS_PER_TRANSACTION or len(equipment_list)
+    transactions = batches = 0
+    for start in range(0, len(equipment_list), rows_per_transaction):
+        chunk = equipment_list[start:start + rows_per_transaction]
+        with ingest_step(using):
+            ChemicalEquipment.objects.using(using).bulk_create(chunk)
+        transactions += 1
+        batches += -(-len(chunk) // rows_per_insert)
+    return {
+        "insert_method": "bulk_create",
+        "bulk_create_rows_per_batch": rows_per_insert,
+        "bulk_create_batches": batches,
+        "insert_transactions": transactions,
+    }
+
+
+def copy_rows(connection, batch_id, columns):
+    """COPY the rows (batch id + `columns`) into the equipment table, in binary format."""
+    table = ChemicalEquipment._meta.db_table
+    column_names = [ChemicalEquipment._meta.get_field(name).column for name in INSERT_FIELDS]
+    quote = connection.ops.quote_name
+    sql = 'COPY {} ({}) FROM STDIN (FORMAT BINARY)'.format(
+        quote(table), ', '.join(quote(name) for name in column_names))
+
+    # A single COPY is atomic by itself. cursor.cursor is the psycopg cursor under
+    # Django's wrapper (so the statements are not in connection.queries)
+    with connection.cursor() as cursor:
+        types = column_types(cursor.cursor, table, column_names)
+        with cursor.cursor.copy(sql) as copy:
+            copy.set_types(types)
+            for row in zip(repeat(batch_id), *columns):
+                copy.write_row(row)
+
+
+def column_types(cursor, table, column_names):
+    """
+    Type oids of `column_names` as the table defines them. Binary COPY needs the
+    exact types, which the model fields don't always give (an int id in a bigint
+    column is a protocol error), so they are read from the catalog.
+    """
+    cursor.execute(
+        "SELECT attname, atttypid FROM pg_attribute"
+        " WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+        [table]
+    )
+    types = dict(cursor.fetchall())
+    return [types[name] for name in column_names]
@@ -0,0 +1,161 @@
+"""
+Typed CSV parser for equipment uploads.
+Reads only the required columns with fixed dtypes (pyarrow engine when installed)
+and sets aside bad rows in an error report instead of failing the whole upload:
+missing, non-numeric or non-finite readings, and rows with the wrong number of fields.
+Column mappings and unit conversions from an IngestProfile are applied here too.
+"""
+import csv
+import importlib.util
+
+from .units import normalize_units
+
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+
+CSV_DTYPES = {
+    'Equipment Name': 'str',
+    'Type': 'category',
+    'Flowrate': 'float64',
+    'Pressure': 'float64',
+    'Temperature': 'float64',
+}
+
+# The pyarrow engine parses in parallel; fall back to pandas' C parser without it
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+
+# Rejected rows are all counted, but only this many are described in the report
+MAX_REPORTED_ERRORS = 1000
+
+
+class MissingColumnsError(ValueError):
+    """The CSV header lacks one or more of the required columns."""
+
+
+def parse_equipment_csv(path, column_map=None, units=None):
+    """
+    Parse an equipment CSV into a DataFrame with the schema of CSV_DTYPES.
+    `column_map` (canonical column -> header in the file) renames site-specific
+    headers, and `units` (column -> unit) converts the readings to the canonical
+    units, on whole columns.
+    Rows with a missing value, a non-numeric or non-finite reading (inf, 1e400),
+    or more or fewer fields than the header are dropped and described in the
+    returned error report.
+    Returns (df, rejected_rows, errors); each error is a dict with the data row
+    number (1-based, header excluded), the column header (None for a malformed
+    row), the raw value and the reason.
+    """
+    # Imported here so that loading the app (serializers, views) doesn't load pandas
+    import numpy as np
+    import pandas as pd
+
+    headers = {col: (column_map or {}).get(col, col) for col in REQUIRED_COLUMNS}
+    to_canonical = {header: col for col, header in headers.items()}
+    usecols = list(headers.values())
+
+    file_columns = pd.read_csv(path, nrows=0).columns
+    missing = [h for h in usecols if h not in file_columns]
+    if missing:
+        raise MissingColumnsError(f"Missing columns: {missing}. Required: {usecols}")
+
+    try:
+        # Fast path: every reading parses as a float
+        dtypes = {headers[col]: dtype for col, dtype in CSV_DTYPES.items()}
+        df, skipped_lines = _read_csv(pd, path, usecols=usecols, dtype=dtypes)
+        df = df.rename(columns=to_canonical)[REQUIRED_COLUMNS]
+        raw = df
+    except ValueError:
+        # Slow path: some cell is not a number. Re-read as text and coerce the readings,
+        # keeping the text around to report what could not be parsed.
+        raw, skipped_lines = _read_csv(pd, path, usecols=usecols, dtype=str)
+        raw = raw.rename(columns=to_canonical)[REQUIRED_COLUMNS]
+        df = raw.copy()
+        df[NUMERIC_COLUMNS] = raw[NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce').astype('float64')
+        df['Type'] = df['Type'].astype('category')
+
+    # Rows with the wrong number of fields were skipped by the parser, which shifts
+    # the rows after them: number them again from the file
+    row_numbers, ragged = None, []
+    if skipped_lines:
+        row_numbers, ragged = _ragged_rows(path, len(file_columns))
+        if len(row_numbers) != len(df):
+            row_numbers = None  # the two readers disagree: keep the parser's numbering
+
+    bad_cells = df[REQUIRED_COLUMNS].isna()
+    # inf (or a reading like 1e400 that overflows to it) can't be stored or sent as JSON
+    bad_cells[NUMERIC_COLUMNS] |= ~np.isfinite(df[NUMERIC_COLUMNS])
+    bad_rows = bad_cells.any(axis=1)
+    rejected_rows = int(bad_rows.sum()) + len(ragged)
+    if not rejected_rows:
+        return normalize_units(df, units or {}), 0, []
+
+    errors = [
+        {"row": row, "column": None, "value": None,
+         "error": f"expected {len(file_columns)} fields, found {n_fields}"}
+        for row, n_fields in ragged[:MAX_REPORTED_ERRORS]
+    ]
+    for col in REQUIRED_COLUMNS:
+        for row in bad_cells.index[bad_cells[col]][:MAX_REPORTED_ERRORS]:
+            value = raw.at[row, col]
+            is_missing = pd.isna(value)
+            if is_missing:
+                reason = "missing value"
+            elif np.isinf(df.at[row, col]):
+                reason = "not a finite number"
+            else:
+                reason = "not a number"
+            errors.append({
+                "row": int(row_numbers[row]) if row_numbers is not None else int(row) + 1,
+                "column": headers[col],
+                "value": None if is_missing else str(value),
+                "error": reason,
+            })
+    errors.sort(key=lambda e: (e["row"], -1 if e["column"] is None else usecols.index(e["column"])))
+    del errors[MAX_REPORTED_ERRORS:]
+
+    df = df[~bad_rows].reset_index(drop=True)
+    df['Type'] = df['Type'].cat.remove_unused_categories()
+    return normalize_units(df, units or {}), rejected_rows, errors
+
+
+def _read_csv(pd, path, **kwargs):
+    """
+    pd.read_csv with CSV_ENGINE. Returns (df, whether any line was skipped).
+    pyarrow raises on a row with more or fewer fields than the header: skip those
+    instead. The C parser reading `usecols` never skips: it ignores extra fields
+    and leaves missing ones empty (reported as missing values).
+    """
+    if CSV_ENGINE != 'pyarrow':
+        return pd.read_csv(path, engine=CSV_ENGINE, **kwargs), False
+
+    skipped = []
+
+    def skip(invalid_row):
+        skipped.append(invalid_row)
+        return 'skip'
+    df = pd.read_csv(path, engine='pyarrow', on_bad_lines=skip, **kwargs)
+    return df, bool(skipped)
+
+
+def _ragged_rows(path, n_fields):
+    """
+    One pass over the file with the csv module (only run when the parser skipped lines).
+    Returns the data row number of every row the parser kept, in order, and
+    (row number, field count) of every row it skipped. Blank lines aren't rows.
+    """
+    import numpy as np
+
+    kept, ragged = [], []
+    with open(path, newline='', encoding='utf-8', errors='replace') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header
+        row = 0
+        for fields in reader:
+            if not fields:
+                continue
+            row += 1
+            if len(fields) == n_fields:
+                kept.append(row)
+            else:
+                ragged.append((row, len(fields)))
+    return np.array(kept, dtype=np.int64), ragged
@@ -0,0 +1,41 @@
+"""
+Single-writer lock for uploads on SQLite.
+
+SQLite allows one writer at a time per database file. Uploads queue on a lock
+file next to the database (shared by every gunicorn worker) before each write
+step, instead of racing for SQLite's own lock and failing with "database is
+locked" once the busy timeout runs out. Readers don't take it: in WAL mode they
+keep serving while an upload writes.
+
+PostgreSQL handles concurrent writers itself, so there the lock is a no-op and
+ingest_step() is just a transaction.
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+
+import fasteners
+from django.db import connections, transaction
+
+# The file lock is held per process; threads of one worker also queue on this
+_thread_lock = threading.Lock()
+
+
+def ingest_lock(using='default'):
+    """Context manager holding the ingest lock of database `using` (a no-op where it is not needed)."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+        return nullcontext()
+    return _file_lock(f"{connection.settings_dict['NAME']}.ingest-lock")
+
+
+@contextmanager
+def _file_lock(path):
+    with _thread_lock, fasteners.InterProcessLock(path):
+        yield
+
+
+@contextmanager
+def ingest_step(using='default'):
+    """One short write step of an upload: the ingest lock plus a transaction."""
+    with ingest_lock(using), transaction.atomic(using=using):
+        yield
@@ -0,0 +1,199 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+Counters and histograms are plain dicts of floats behind a lock, cheap enough to
+update on every request. Each worker process keeps its own values; scrape every
+worker (or run one) to see the full picture.
+"""
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic total, optionally split by labels."""
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram:
+    """Distribution of observed values (usually durations in seconds) in cumulative buckets."""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time spent in the `with` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+def render():
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+# Requests (filled by core.middleware.MetricsMiddleware)
+REQUEST_LATENCY_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Request latency by view.', ['view', 'method'])
+REQUESTS_TOTAL = Counter(
+    'http_requests_total', 'Requests by view and response status.', ['view', 'method', 'status'])
+DB_QUERIES_TOTAL = Counter(
+    'db_queries_total', 'SQL queries executed while serving requests, by view.', ['view'])
+
+# Ingest (filled by FileUploadView)
+INGEST_PHASE_SECONDS = Histogram(
+    'ingest_phase_duration_seconds', 'Time spent in each phase of a CSV upload.', ['phase'])
+INGEST_ROWS_TOTAL = Counter(
+    'ingest_rows_total', 'Equipment rows inserted by uploads.')
+INGEST_BYTES_TOTAL = Counter(
+    'ingest_bytes_total', 'Bytes of CSV received by uploads.')
+
+# Reports
+PDF_RENDER_SECONDS = Histogram(
+    'pdf_render_duration_seconds', 'Time spent building PDF reports.')
+
+
+class IngestPerformanceReport:
+    """
+    Wall time, CPU time and peak Python memory of each phase of one upload.
+    Every phase is also observed in INGEST_PHASE_SECONDS, so the same timings
+    feed /metrics and the report stored on the batch.
+    CPU time is process-wide (it includes pyarrow's parser threads), and memory
+    is what tracemalloc sees, i.e. Python allocations, not native buffers.
+    """
+
+    # tracemalloc is process-wide: concurrent uploads (threaded workers) share it,
+    # and the last report to finish stops it
+    _tracing_lock = threading.Lock()
+    _tracing_users = 0
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self._tracing = False
+        if trace_memory:
+            with self._tracing_lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                IngestPerformanceReport._tracing_users += 1
+                self._tracing = True
+        self.phases = []
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            entry = {
+                "name": name,
+                "wall_seconds": round(wall, 6),
+                "cpu_seconds": round(time.process_time() - cpu_start, 6),
+            }
+            if self.trace_memory:
+                entry["peak_python_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+            self.phases.append(entry)
+            INGEST_PHASE_SECONDS.observe(wall, phase=name)
+
+    def stop(self):
+        """Release memory tracing; stops it if no other upload uses it. Safe to call twice."""
+        if self._tracing:
+            with self._tracing_lock:
+                IngestPerformanceReport._tracing_users -= 1
+                if IngestPerformanceReport._tracing_users == 0:
+                    tracemalloc.stop()
+            self._tracing = False
+
+    def as_dict(self):
+        wall = sum(p["wall_seconds"] for p in self.phases)
+        rows = self.counters.get("rows", 0)
+        report = {
+            "total_wall_seconds": round(wall, 6),
+            "total_cpu_seconds": round(sum(p["cpu_seconds"] for p in self.phases), 6),
+            "rows_per_second": round(rows / wall, 1) if wall else None,
+            **self.counters,
+            "phases": self.phases,
+        }
+        if self.trace_memory:
+            report["peak_python_memory_bytes"] = max((p["peak_python_memory_bytes"] for p in self.phases), default=0)
+        return report
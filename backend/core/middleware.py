@@ -0,0 +1,123 @@
+import cProfile
+import hmac
+import json
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+
+from .metrics import REQUEST_LATENCY_SECONDS, REQUESTS_TOTAL, DB_QUERIES_TOTAL
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and SQL query count of every request, labelled
+    by the name of the URL pattern that served it (e.g. "file-upload").
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+
+        REQUEST_LATENCY_SECONDS.observe(elapsed, view=view, method=request.method)
+        REQUESTS_TOTAL.inc(view=view, method=request.method, status=response.status_code)
+        DB_QUERIES_TOTAL.inc(queries[0], view=view)
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles a single request on demand: when PROFILING_TOKEN is set and the request
+    carries it in the X-Profile-Token header (or the ?_profile= query parameter), the
+    view runs under cProfile and every SQL query is logged with its duration.
+    The results are written to PROFILES_DIR as <id>.prof (pstats) and <id>.sql.json,
+    and the id is returned in the X-Profile-Id response header.
+    One profiled request at a time per process (Python 3.12+ refuses a second active
+    profiler): an overlapping one gets a 409 and can be retried.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = settings.PROFILING_TOKEN
+        supplied = request.headers.get('X-Profile-Token') or request.GET.get('_profile')
+        if not token or not supplied or not hmac.compare_digest(supplied, token):
+            return self.get_response(request)
+
+        if not self._lock.acquire(blocking=False):
+            response = JsonResponse({"error": "Another request is being profiled; retry when it finishes"},
+                                    status=409)
+            response['Retry-After'] = '1'
+            return response
+        try:
+            return self.profile(request)
+        finally:
+            self._lock.release()
+
+    def profile(self, request):
+        """Run the request under cProfile and the query logger; save both (caller holds the lock)."""
+        queries = []
+
+        def log_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries.append({
+                    "sql": sql,
+                    "params": None if many else repr(params),
+                    "many": many,
+                    "seconds": round(time.perf_counter() - start, 6),
+                })
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with connection.execute_wrapper(log_query):
+            response = profiler.runcall(self.get_response, request)
+        elapsed = time.perf_counter() - start
+
+        profile_id = self.save(request, response, profiler, queries, elapsed)
+        response['X-Profile-Id'] = profile_id
+        return response
+
+    def save(self, request, response, profiler, queries, elapsed):
+        profiles_dir = settings.PROFILES_DIR
+        profiles_dir.mkdir(parents=True, exist_ok=True)
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-')[:60] or 'root'
+        profile_id = f"{stamp}-{request.method.lower()}-{slug}"
+
+        profiler.dump_stats(profiles_dir / f"{profile_id}.prof")
+        with open(profiles_dir / f"{profile_id}.sql.json", 'w') as f:
+            json.dump({
+                "path": request.path,
+                "method": request.method,
+                "status": response.status_code,
+                "wall_seconds": round(elapsed, 6),
+                "query_count": len(queries),
+                "query_seconds": round(sum(q["seconds"] for q in queries), 6),
+                "queries": queries,
+            }, f, indent=1)
+        return profile_id
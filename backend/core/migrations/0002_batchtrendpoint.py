@@ -0,0 +1,59 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+def backfill_trend_points(apps, schema_editor):
+    """Create the trend point of every batch uploaded before the series existed."""
+    UploadBatch = apps.get_model('core', 'UploadBatch')
+    ChemicalEquipment = apps.get_model('core', 'ChemicalEquipment')
+    BatchTrendPoint = apps.get_model('core', 'BatchTrendPoint')
+    db_alias = schema_editor.connection.alias
+
+    for batch in UploadBatch.objects.using(db_alias).all():
+        equipments = ChemicalEquipment.objects.using(db_alias).filter(batch=batch)
+        aggregates = equipments.aggregate(
+            total=Count('id'),
+            avg_flow=Avg('flowrate'),
+            avg_pressure=Avg('pressure'),
+            avg_temp=Avg('temperature')
+        )
+        type_counts = equipments.values('equipment_type').annotate(n=Count('id'))
+        BatchTrendPoint.objects.using(db_alias).create(
+            batch=batch,
+            uploaded_at=batch.uploaded_at,
+            total_count=aggregates['total'],
+            average_flowrate=round(aggregates['avg_flow'] or 0, 2),
+            average_pressure=round(aggregates['avg_pressure'] or 0, 2),
+            average_temperature=round(aggregates['avg_temp'] or 0, 2),
+            type_distribution={row['equipment_type']: row['n'] for row in type_counts},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchTrendPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uploaded_at', models.DateTimeField(db_index=True)),
+                ('total_count', models.PositiveIntegerField()),
+                ('average_flowrate', models.FloatField()),
+                ('average_pressure', models.FloatField()),
+                ('average_temperature', models.FloatField()),
+                ('type_distribution', models.JSONField(default=dict)),
+                ('batch', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trend_point', to='core.uploadbatch')),
+            ],
+            options={
+                'ordering': ['uploaded_at', 'id'],
+            },
+        ),
+        migrations.RunPython(backfill_trend_points, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_batchtrendpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chemicalequipment',
+            index=models.Index(fields=['equipment_name', 'batch'], name='equipment_name_batch_idx'),
+        ),
+    ]
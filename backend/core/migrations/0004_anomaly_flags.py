@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_equipment_name_batch_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chemicalequipment',
+            name='is_anomaly',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='chemicalequipment',
+            name='pressure_zscore',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='chemicalequipment',
+            name='temperature_zscore',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='chemicalequipment',
+            index=models.Index(condition=models.Q(('is_anomaly', True)), fields=['batch'], name='equipment_anomaly_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_anomaly_flags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('equipment_type', models.CharField(blank=True, max_length=100)),
+                ('field', models.CharField(choices=[('flowrate', 'Flowrate'), ('pressure', 'Pressure'), ('temperature', 'Temperature')], max_length=20)),
+                ('operator', models.CharField(choices=[('>', 'greater than'), ('>=', 'greater than or equal to'), ('<', 'less than'), ('<=', 'less than or equal to')], max_length=2)),
+                ('threshold', models.FloatField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AlertViolation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule_label', models.CharField(max_length=255)),
+                ('violation_count', models.PositiveIntegerField()),
+                ('sample_equipment', models.JSONField(default=list)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_violations', to='core.uploadbatch')),
+                ('rule', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='violations', to='core.alertrule')),
+            ],
+        ),
+    ]
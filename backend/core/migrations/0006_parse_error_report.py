@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alert_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='error_report',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='rejected_rows',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 23:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# No data migration: readings already stored came from files without a profile,
+# which are taken to be in the canonical units (bar for pressure, see core/units.py).
+# They keep their values; only the "Pa" label formerly shown for pressure changed.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_parse_error_report'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('column_map', models.JSONField(blank=True, default=dict)),
+                ('flowrate_unit', models.CharField(choices=[('m3/h', 'm³/hr'), ('m3/s', 'm³/s'), ('L/min', 'L/min')], default='m3/h', max_length=10)),
+                ('pressure_unit', models.CharField(choices=[('bar', 'bar'), ('kPa', 'kPa'), ('Pa', 'Pa'), ('psi', 'psi')], default='bar', max_length=10)),
+                ('temperature_unit', models.CharField(choices=[('C', '°C'), ('K', 'K'), ('F', '°F')], default='C', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='profile',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='batches', to='core.ingestprofile'),
+        ),
+    ]
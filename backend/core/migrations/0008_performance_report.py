@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_ingest_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='performance_report',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:21
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_history_fields(apps, schema_editor):
+    """Store the equipment count and original filename of batches uploaded before these fields existed."""
+    UploadBatch = apps.get_model('core', 'UploadBatch')
+    db_alias = schema_editor.connection.alias
+
+    batches = list(UploadBatch.objects.using(db_alias).annotate(total=Count('equipments')))
+    for batch in batches:
+        batch.equipment_count = batch.total
+        batch.filename = batch.file.name.split('/')[-1]
+    UploadBatch.objects.using(db_alias).bulk_update(batches, ['equipment_count', 'filename'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_performance_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='equipment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='filename',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='uploadbatch',
+            index=models.Index(fields=['-uploaded_at', '-id'], name='batch_history_idx'),
+        ),
+        migrations.RunPython(backfill_history_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-19 00:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_existing_batches(apps, schema_editor):
+    """
+    Give batches uploaded before ownership existed to the first superuser (or the
+    first user), so they stay reachable. With no users at all they stay unowned.
+    """
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    UploadBatch = apps.get_model('core', 'UploadBatch')
+    BatchTrendPoint = apps.get_model('core', 'BatchTrendPoint')
+    db_alias = schema_editor.connection.alias
+
+    owner = (User.objects.using(db_alias).filter(is_superuser=True).order_by('id').first()
+             or User.objects.using(db_alias).order_by('id').first())
+    if owner is None:
+        return
+    UploadBatch.objects.using(db_alias).filter(owner__isnull=True).update(owner=owner)
+    BatchTrendPoint.objects.using(db_alias).filter(owner__isnull=True).update(owner=owner)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_upload_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='uploadbatch',
+            name='batch_history_idx',
+        ),
+        migrations.AddField(
+            model_name='batchtrendpoint',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='uploadbatch',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='upload_batches', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='batchtrendpoint',
+            name='uploaded_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='batchtrendpoint',
+            index=models.Index(fields=['owner', 'uploaded_at', 'id'], name='trend_owner_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadbatch',
+            index=models.Index(fields=['owner', '-uploaded_at', '-id'], name='batch_owner_history_idx'),
+        ),
+        migrations.RunPython(assign_existing_batches, migrations.RunPython.noop),
+    ]
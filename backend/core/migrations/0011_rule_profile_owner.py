@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-19 01:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_existing_rules_and_profiles(apps, schema_editor):
+    """
+    Give alert rules and ingest profiles created before ownership existed to the
+    first superuser (or the first user), like the batches in 0010.
+    With no users at all they stay unowned.
+    """
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    AlertRule = apps.get_model('core', 'AlertRule')
+    IngestProfile = apps.get_model('core', 'IngestProfile')
+    db_alias = schema_editor.connection.alias
+
+    owner = (User.objects.using(db_alias).filter(is_superuser=True).order_by('id').first()
+             or User.objects.using(db_alias).order_by('id').first())
+    if owner is None:
+        return
+    AlertRule.objects.using(db_alias).filter(owner__isnull=True).update(owner=owner)
+    IngestProfile.objects.using(db_alias).filter(owner__isnull=True).update(owner=owner)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_batch_owner'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertrule',
+            name='owner',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='alert_rules', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='ingestprofile',
+            name='owner',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ingest_profiles', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='ingestprofile',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='ingestprofile',
+            constraint=models.UniqueConstraint(fields=('owner', 'name'), name='ingest_profile_owner_name_uniq'),
+        ),
+        migrations.RunPython(assign_existing_rules_and_profiles, migrations.RunPython.noop),
+    ]
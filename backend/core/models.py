@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from .units import FLOWRATE_UNIT_CHOICES, PRESSURE_UNIT_CHOICES, TEMPERATURE_UNIT_CHOICES
 
 class UploadBatch(models.Model):
     """
@@ -8,6 +10,32 @@ class UploadBatch(models.Model):
     file = models.FileField(upload_to='uploads/')
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    # User who uploaded it; every batch query is scoped to the requesting user
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True,
+                              related_name='upload_batches', db_index=False)  # covered by batch_owner_history_idx
+
+    # Name the file was uploaded with (the stored one may get a suffix), for listing and filtering
+    filename = models.CharField(max_length=255, blank=True)
+
+    # Rows stored for this batch, so history listings don't count them per request
+    equipment_count = models.PositiveIntegerField(default=0)
+
+    # Column mapping / units the file was read with (None: canonical headers and units)
+    profile = models.ForeignKey('IngestProfile', on_delete=models.SET_NULL, null=True, blank=True, related_name='batches')
+
+    # Rows dropped by the parser (bad values, wrong number of fields) and what was wrong with them
+    rejected_rows = models.PositiveIntegerField(default=0)
+    error_report = models.JSONField(default=list, blank=True)
+
+    # Wall/CPU time and peak memory of each ingest phase (see metrics.IngestPerformanceReport)
+    performance_report = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            # One user's history pages: newest first, id breaks ties between equal timestamps
+            models.Index(fields=['owner', '-uploaded_at', '-id'], name='batch_owner_history_idx'),
+        ]
+
     def __str__(self):
         return f"Upload at {self.uploaded_at}"
 
@@ -26,5 +54,163 @@ class ChemicalEquipment(models.Model):
     pressure = models.FloatField()
     temperature = models.FloatField()
 
+    # Outlier flags computed at ingest against the row's equipment type
+    pressure_zscore = models.FloatField(default=0)
+    temperature_zscore = models.FloatField(default=0)
+    is_anomaly = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Per-equipment history: equality on the name, then walk the batches in order
+            models.Index(fields=['equipment_name', 'batch'], name='equipment_name_batch_idx'),
+            # Anomaly listing: partial index, holds only the (few) flagged rows
+            models.Index(fields=['batch'], condition=models.Q(is_anomaly=True), name='equipment_anomaly_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_name} ({self.equipment_type})"
+
+
+class BatchTrendPoint(models.Model):
+    """
+    One point of the cross-batch trend series.
+    Written once when a batch is ingested and removed together with the
+    batch (CASCADE), so reading the trends never touches ChemicalEquipment rows.
+    """
+    batch = models.OneToOneField(UploadBatch, on_delete=models.CASCADE, related_name='trend_point')
+
+    # Copied from the batch so the series can be read, scoped and ordered from this table alone
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True,
+                              related_name='+', db_index=False)  # covered by trend_owner_time_idx
+    uploaded_at = models.DateTimeField()
+
+    # Batch-level metrics, same shape as the upload "statistics" payload
+    total_count = models.PositiveIntegerField()
+    average_flowrate = models.FloatField()
+    average_pressure = models.FloatField()
+    average_temperature = models.FloatField()
+    type_distribution = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ['uploaded_at', 'id']
+        indexes = [
+            models.Index(fields=['owner', 'uploaded_at', 'id'], name='trend_owner_time_idx'),
+        ]
+
+    @classmethod
+    def from_statistics(cls, batch, stats):
+        """Build (unsaved) the trend point for a batch from its computed statistics."""
+        return cls(
+            batch=batch,
+            owner_id=batch.owner_id,
+            uploaded_at=batch.uploaded_at,
+            total_count=stats['total_count'],
+            average_flowrate=float(stats['average_flowrate']),
+            average_pressure=float(stats['average_pressure']),
+            average_temperature=float(stats['average_temperature']),
+            type_distribution={str(k): int(v) for k, v in stats['type_distribution'].items()},
+        )
+
+    def as_statistics(self):
+        """The batch statistics in the upload "statistics" payload shape."""
+        return {
+            "total_count": self.total_count,
+            "average_flowrate": self.average_flowrate,
+            "average_pressure": self.average_pressure,
+            "average_temperature": self.average_temperature,
+            "type_distribution": self.type_distribution,
+        }
+
+    def __str__(self):
+        return f"Trend point for batch {self.batch_id}"
+
+
+class AlertRule(models.Model):
+    """
+    Declarative threshold rule checked against every upload of its owner,
+    e.g. "Compressor pressure > 9" or "any temperature > 140".
+    """
+    FIELD_CHOICES = [
+        ('flowrate', 'Flowrate'),
+        ('pressure', 'Pressure'),
+        ('temperature', 'Temperature'),
+    ]
+    OPERATOR_CHOICES = [
+        ('>', 'greater than'),
+        ('>=', 'greater than or equal to'),
+        ('<', 'less than'),
+        ('<=', 'less than or equal to'),
+    ]
+
+    # User who created it; rules are listed, edited and evaluated per user
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True,
+                              related_name='alert_rules')
+
+    name = models.CharField(max_length=100, blank=True)
+    # Blank means the rule applies to every equipment type
+    equipment_type = models.CharField(max_length=100, blank=True)
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    operator = models.CharField(max_length=2, choices=OPERATOR_CHOICES)
+    threshold = models.FloatField()
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def expression(self):
+        scope = self.equipment_type or 'any'
+        return f"{scope} {self.field} {self.operator} {self.threshold:g}"
+
+    def __str__(self):
+        return self.name or self.expression
+
+
+class AlertViolation(models.Model):
+    """
+    Result of one rule against one batch, stored when the batch is ingested.
+    Only rules with at least one matching row get a violation.
+    """
+    batch = models.ForeignKey(UploadBatch, on_delete=models.CASCADE, related_name='alert_violations')
+    # Rules can be edited or deleted later, so keep the label as it was at ingest time
+    rule = models.ForeignKey(AlertRule, on_delete=models.SET_NULL, null=True, related_name='violations')
+    rule_label = models.CharField(max_length=255)
+    violation_count = models.PositiveIntegerField()
+    # First few offending equipment names, for the report
+    sample_equipment = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"{self.rule_label}: {self.violation_count} rows in batch {self.batch_id}"
+
+
+class IngestProfile(models.Model):
+    """
+    Saved column mapping and units of one site's CSV exports.
+    Uploads that pick a profile are renamed to the canonical columns and
+    converted to the canonical units (see units.py) before insert.
+    Profiles belong to the user who saved them; names are unique per user.
+    """
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True,
+                              related_name='ingest_profiles', db_index=False)  # covered by ingest_profile_owner_name_uniq
+    name = models.CharField(max_length=100)
+    # Canonical column -> header used in this site's files, e.g. {"Pressure": "P (kPa)"}.
+    # Columns left out keep their canonical header.
+    column_map = models.JSONField(default=dict, blank=True)
+    flowrate_unit = models.CharField(max_length=10, choices=FLOWRATE_UNIT_CHOICES, default='m3/h')
+    pressure_unit = models.CharField(max_length=10, choices=PRESSURE_UNIT_CHOICES, default='bar')
+    temperature_unit = models.CharField(max_length=10, choices=TEMPERATURE_UNIT_CHOICES, default='C')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'name'], name='ingest_profile_owner_name_uniq'),
+        ]
+
+    @property
+    def units(self):
+        return {
+            'Flowrate': self.flowrate_unit,
+            'Pressure': self.pressure_unit,
+            'Temperature': self.temperature_unit,
+        }
+
     def __str__(self):
-        return f"{self.equipment_name} ({self.equipment_type})"
\ No newline at end of file
+        return self.name
@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UploadHistoryPagination(CursorPagination):
+    """
+    Keyset pagination over one user's upload batches, newest first.
+    Each page seeks on (owner, uploaded_at, id) through batch_owner_history_idx, so a page
+    costs the same however many batches precede it (no OFFSET scan, no COUNT).
+    """
+    ordering = ('-uploaded_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import UploadBatch, ChemicalEquipment
+from .models import UploadBatch, ChemicalEquipment, AlertRule, AlertViolation, IngestProfile
+from .ingest import REQUIRED_COLUMNS
 
 class ChemicalEquipmentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -12,4 +13,56 @@ class UploadBatchSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UploadBatch
-        fields = ['id', 'file', 'uploaded_at', 'equipments']
\ No newline at end of file
+        fields = ['id', 'file', 'uploaded_at', 'equipments']
+
+
+class UploadHistorySerializer(serializers.ModelSerializer):
+    """One entry of the upload history (no equipment rows)."""
+
+    class Meta:
+        model = UploadBatch
+        fields = ['id', 'filename', 'uploaded_at', 'equipment_count', 'rejected_rows']
+
+
+class AlertRuleSerializer(serializers.ModelSerializer):
+    expression = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = AlertRule
+        fields = ['id', 'name', 'equipment_type', 'field', 'operator', 'threshold',
+                  'is_active', 'expression', 'created_at']
+
+class AlertViolationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AlertViolation
+        fields = ['rule', 'rule_label', 'violation_count', 'sample_equipment']
+
+
+class IngestProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = IngestProfile
+        fields = ['id', 'name', 'column_map', 'flowrate_unit', 'pressure_unit',
+                  'temperature_unit', 'created_at']
+
+    def validate_name(self, value):
+        # Unique per owner; the owner isn't a serializer field, it comes from the request
+        owner = self.context['request'].user
+        profiles = IngestProfile.objects.filter(owner=owner, name=value)
+        if self.instance is not None:
+            profiles = profiles.exclude(id=self.instance.id)
+        if profiles.exists():
+            raise serializers.ValidationError("You already have a profile with this name.")
+        return value
+
+    def validate_column_map(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Must be an object mapping required columns to CSV headers.")
+        unknown = [key for key in value if key not in REQUIRED_COLUMNS]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown columns {unknown}. Mappable columns: {REQUIRED_COLUMNS}")
+        if not all(isinstance(header, str) and header.strip() for header in value.values()):
+            raise serializers.ValidationError("CSV headers must be non-empty strings.")
+        headers = {col: value.get(col, col) for col in REQUIRED_COLUMNS}
+        if len(set(headers.values())) != len(headers):
+            raise serializers.ValidationError("Two columns cannot be read from the same CSV header.")
+        return value
@@ -1,3 +1,677 @@
-from django.test import TestCase
+"""
+API tests.
 
-# Create your tests here.
+Query budgets: the most SQL queries each endpoint may run per request. Every URL
+in core.urls declares a budget in QUERY_BUDGETS, and each endpoint is requested
+with one batch and again with a full history; it fails if it goes over budget,
+or if its query count grows with the number of batches (an N+1).
+Budgets include the user lookup done by Basic authentication, not savepoints
+(each upload write step is a transaction, nested in the test's own).
+
+Run with:  python manage.py test core
+"""
+import base64
+import json
+import re
+import shutil
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from .analytics import evaluate_rules, factorize_types, flag_anomalies, group_zscores
+from .bulk import supports_copy
+from .ingest import CSV_ENGINE
+from .metrics import IngestPerformanceReport, render as render_metrics
+from .middleware import RequestProfilingMiddleware
+from .models import UploadBatch, ChemicalEquipment, AlertRule, IngestProfile
+from .thresholds import ANOMALY_ZSCORE_THRESHOLD
+from .units import normalize_units
+
+SAMPLE_CSV = Path(settings.BASE_DIR).parent / 'sample_equipment_data.csv'
+
+# (method, URL name) -> maximum queries per request, independent of how many batches exist.
+# The upload budget holds for files under one bulk_create batch (SQLite: 111 rows);
+# bigger files add one INSERT per batch. On PostgreSQL the rows go in one COPY, whatever the size.
+QUERY_BUDGETS = {
+    ('GET', 'file-upload'): 2,
+    ('GET', 'upload-history'): 2,
+    ('POST', 'file-upload'): 13,
+    ('GET', 'export-pdf'): 4,
+    ('GET', 'batch-analysis'): 3,
+    ('GET', 'batch-performance'): 2,
+    ('GET', 'batch-errors'): 2,
+    ('GET', 'batch-anomalies'): 3,
+    ('GET', 'alert-rule-list'): 2,
+    ('GET', 'alert-rule-detail'): 2,
+    ('GET', 'ingest-profile-list'): 2,
+    ('GET', 'ingest-profile-detail'): 2,
+    ('GET', 'batch-trends'): 2,
+    ('GET', 'equipment-history'): 2,
+    ('GET', 'profile-list'): 1,
+    ('GET', 'profile-download'): 1,
+    ('POST', 'register'): 3,
+    ('POST', 'login'): 1,
+}
+
+HISTORY_SIZE = 5
+
+SAVEPOINT_SQL = re.compile(r'(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT) ')
+
+
+# MD5 keeps Basic auth cheap enough to authenticate every request
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTestCase(APITestCase):
+    """Requests made through assertWithinBudget() fail when they exceed QUERY_BUDGETS."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(MEDIA_ROOT=cls.media_root, PROFILES_DIR=Path(cls.media_root) / 'profiles')
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_superuser('budget', password='budget-password')
+        self.log_in('budget', 'budget-password')
+
+    def log_in(self, username, password):
+        self.client.credentials(HTTP_AUTHORIZATION=self.basic_auth(username, password))
+
+    @staticmethod
+    def basic_auth(username, password):
+        return 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+
+    def upload_csv(self, text, name='plant.csv'):
+        upload = SimpleUploadedFile(name, text.encode(), content_type='text/csv')
+        return self.client.post(reverse('file-upload'), {'file': upload}, format='multipart')
+
+    def upload_sample(self):
+        with open(SAMPLE_CSV, 'rb') as f:
+            response = self.client.post(reverse('file-upload'), {'file': f}, format='multipart')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['batch_id']
+
+    def count_queries(self, method, url_name, kwargs=None, data=None, **extra):
+        """(response, SQL of the queries) of one request."""
+        url = reverse(url_name, kwargs=kwargs)
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(self.client, method.lower())(url, data, **extra)
+        self.assertLess(response.status_code, 400, f"{method} {url} -> {response.status_code}")
+        queries = [q['sql'] for q in captured.captured_queries if not SAVEPOINT_SQL.match(q['sql'])]
+        return response, queries
+
+    def assertWithinBudget(self, method, url_name, kwargs=None, data=None, **extra):
+        budget = QUERY_BUDGETS[(method, url_name)]
+        response, queries = self.count_queries(method, url_name, kwargs, data, **extra)
+        if len(queries) > budget:
+            listing = '\n'.join(f"  {i}. {sql}" for i, sql in enumerate(queries, 1))
+            self.fail(f"{method} {url_name} ran {len(queries)} queries, budget is {budget}:\n{listing}")
+        return response, len(queries)
+
+
+class QueryBudgetTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        AlertRule.objects.create(owner=self.user, field='pressure', operator='>', threshold=7)
+        self.profile = IngestProfile.objects.create(owner=self.user, name='site', column_map={}, pressure_unit='kPa')
+
+    def batch_endpoints(self, batch_id):
+        return [
+            ('GET', 'file-upload', None),
+            ('GET', 'upload-history', None),
+            ('GET', 'batch-analysis', {'batch_id': batch_id}),
+            ('GET', 'batch-performance', {'batch_id': batch_id}),
+            ('GET', 'batch-errors', {'batch_id': batch_id}),
+            ('GET', 'batch-anomalies', {'batch_id': batch_id}),
+            ('GET', 'export-pdf', {'batch_id': batch_id}),
+            ('GET', 'batch-trends', None),
+            ('GET', 'equipment-history', {'equipment_name': 'Pump-1'}),
+        ]
+
+    def test_every_endpoint_declares_a_budget(self):
+        declared = {name for _, name in QUERY_BUDGETS}
+        resolver = get_resolver('core.urls')
+        missing = sorted(p.name for p in resolver.url_patterns if p.name not in declared)
+        self.assertEqual(missing, [], "add these URL names to QUERY_BUDGETS")
+
+    def test_batch_reads_do_not_grow_with_history(self):
+        first = self.upload_sample()
+        single = {name: self.assertWithinBudget(method, name, kwargs)[1]
+                  for method, name, kwargs in self.batch_endpoints(first)}
+
+        for _ in range(HISTORY_SIZE - 1):
+            self.upload_sample()
+        full = {name: self.assertWithinBudget(method, name, kwargs)[1]
+                for method, name, kwargs in self.batch_endpoints(first)}
+
+        self.assertEqual(full, single)
+
+    @override_settings(UPLOAD_HISTORY_LIMIT=HISTORY_SIZE)
+    def test_upload(self):
+        # With a full history, so the upload also prunes the oldest batch
+        for _ in range(HISTORY_SIZE):
+            self.upload_sample()
+        with open(SAMPLE_CSV, 'rb') as f:
+            self.assertWithinBudget('POST', 'file-upload', data={'file': f, 'profile': 'site'}, format='multipart')
+        self.assertEqual(UploadBatch.objects.count(), HISTORY_SIZE)
+
+    def test_configuration_reads(self):
+        rule = AlertRule.objects.get()
+        self.assertWithinBudget('GET', 'alert-rule-list')
+        self.assertWithinBudget('GET', 'alert-rule-detail', {'rule_id': rule.id})
+        self.assertWithinBudget('GET', 'ingest-profile-list')
+        self.assertWithinBudget('GET', 'ingest-profile-detail', {'profile_id': self.profile.id})
+
+    def test_request_profiles(self):
+        profiles_dir = settings.PROFILES_DIR
+        profiles_dir.mkdir(parents=True, exist_ok=True)
+        (profiles_dir / '20260101T000000000000-get-api-upload.prof').write_bytes(b'')
+        (profiles_dir / '20260101T000000000000-get-api-upload.sql.json').write_text('{"path": "/api/upload/"}')
+        self.assertWithinBudget('GET', 'profile-list')
+        self.assertWithinBudget('GET', 'profile-download', {'filename': '20260101T000000000000-get-api-upload.prof'})
+
+    def test_auth_endpoints(self):
+        self.client.credentials()
+        self.assertWithinBudget('POST', 'register', data={
+            'username': 'newuser', 'email': 'new@example.com',
+            'password': 'secret123', 'confirm_password': 'secret123'}, format='json')
+        self.assertWithinBudget('POST', 'login', data={'username': 'newuser', 'password': 'secret123'}, format='json')
+
+
+class UploadHistoryTests(QueryBudgetTestCase):
+
+    def make_batches(self, count):
+        """`count` batches uploaded one day apart from 2026-03-01, oldest first."""
+        batches = UploadBatch.objects.bulk_create([
+            UploadBatch(owner=self.user, file=f'uploads/plant_{i}.csv', filename=f'plant_{i}.csv', equipment_count=i)
+            for i in range(count)
+        ])
+        start = timezone.make_aware(datetime(2026, 3, 1))
+        for i, batch in enumerate(batches):
+            batch.uploaded_at = start + timedelta(days=i)
+        UploadBatch.objects.bulk_update(batches, ['uploaded_at'])
+        return batches
+
+    def test_pages_cover_every_batch_once(self):
+        self.make_batches(12)
+
+        seen, url = [], reverse('upload-history') + '?page_size=5'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item['filename'] for item in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(seen, [f'plant_{i}.csv' for i in reversed(range(12))])
+
+    def test_filters(self):
+        batches = self.make_batches(10)
+        batches[7].filename = 'North_Site.csv'
+        batches[7].save(update_fields=['filename'])
+
+        response = self.client.get(reverse('upload-history'),
+                                   {'uploaded_after': '2026-03-03', 'uploaded_before': '2026-03-06'})
+        self.assertEqual([item['id'] for item in response.data['results']],
+                         [batches[4].id, batches[3].id, batches[2].id])
+
+        response = self.client.get(reverse('upload-history'), {'filename': 'north'})
+        self.assertEqual([item['id'] for item in response.data['results']], [batches[7].id])
+
+        response = self.client.get(reverse('upload-history'), {'uploaded_after': 'last week'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_listing_is_compressed_for_gzip_clients(self):
+        self.make_batches(12)
+        response = self.client.get(reverse('upload-history'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class BatchOwnershipTests(QueryBudgetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user('other', password='other-password')
+
+    def test_batches_are_private_to_their_owner(self):
+        batch_id = self.upload_sample()
+        self.log_in('other', 'other-password')
+
+        self.assertEqual(self.client.get(reverse('file-upload')).data, [])
+        self.assertEqual(self.client.get(reverse('upload-history')).data['results'], [])
+        self.assertEqual(self.client.get(reverse('batch-trends')).data['points'], 0)
+        self.assertEqual(self.client.get(reverse('equipment-history', args=['Pump-1'])).status_code, 404)
+        for name in ['batch-analysis', 'batch-performance', 'batch-errors', 'batch-anomalies', 'export-pdf']:
+            self.assertEqual(self.client.get(reverse(name, args=[batch_id])).status_code, 404, name)
+
+    def test_pdf_export_requires_authentication(self):
+        batch_id = self.upload_sample()
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse('export-pdf', args=[batch_id])).status_code, 401)
+
+    def test_rules_and_profiles_are_private_to_their_owner(self):
+        rule = AlertRule.objects.create(owner=self.user, field='pressure', operator='>', threshold=0)
+        profile = IngestProfile.objects.create(owner=self.user, name='site', column_map={})
+        self.log_in('other', 'other-password')
+
+        self.assertEqual(self.client.get(reverse('alert-rule-list')).data, [])
+        self.assertEqual(self.client.get(reverse('ingest-profile-list')).data, [])
+        for method in ['get', 'patch', 'delete']:
+            self.assertEqual(getattr(self.client, method)(reverse('alert-rule-detail', args=[rule.id])).status_code, 404)
+            self.assertEqual(getattr(self.client, method)(reverse('ingest-profile-detail', args=[profile.id])).status_code, 404)
+
+        # Another user's rules aren't evaluated, and their profile can't be picked
+        response = self.upload_csv("Equipment Name,Type,Flowrate,Pressure,Temperature\nP1,Pump,100,5,110\n")
+        self.assertEqual(response.data['alerts'], [])
+        with open(SAMPLE_CSV, 'rb') as f:
+            response = self.client.post(reverse('file-upload'), {'file': f, 'profile': 'site'}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+        # Profile names are unique per user, not globally
+        response = self.client.post(reverse('ingest-profile-list'), {'name': 'site', 'column_map': {}}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        response = self.client.post(reverse('ingest-profile-list'), {'name': 'site', 'column_map': {}}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(UPLOAD_HISTORY_LIMIT=2)
+    def test_retention_applies_per_user(self):
+        self.log_in('other', 'other-password')
+        other_batch = self.upload_sample()
+
+        self.log_in('budget', 'budget-password')
+        own_batches = [self.upload_sample() for _ in range(3)]
+
+        self.assertEqual(list(UploadBatch.objects.filter(owner=self.user).order_by('id').values_list('id', flat=True)),
+                         own_batches[1:])
+        self.assertTrue(UploadBatch.objects.filter(id=other_batch).exists())
+
+
+class UploadStorageTests(QueryBudgetTestCase):
+
+    def test_upload_stores_every_row(self):
+        batch_id = self.upload_sample()
+        batch = UploadBatch.objects.get(id=batch_id)
+        stored = ChemicalEquipment.objects.filter(batch=batch)
+
+        self.assertEqual(stored.count(), batch.equipment_count)
+        self.assertEqual(stored.filter(equipment_name='Pump-1').values_list('equipment_type', flat=True).get(), 'Pump')
+        expected = 'copy' if supports_copy(connection) else 'bulk_create'
+        self.assertEqual(batch.performance_report['insert_method'], expected)
+
+
+HEADER = "Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+
+
+class TrendSeriesTests(QueryBudgetTestCase):
+
+    def upload(self, rows):
+        response = self.upload_csv(HEADER + rows)
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['batch_id']
+
+    def test_one_point_per_batch_oldest_first(self):
+        first = self.upload("P1,Pump,100,5,110\nP2,Pump,120,7,130\nV1,Valve,50,2,90\n")
+        second = self.upload("P1,Pump,90,4,100\nC1,Compressor,200,9,150\n")
+
+        trends = self.client.get(reverse('batch-trends')).data
+        self.assertEqual(trends['points'], 2)
+        self.assertEqual(trends['batch_ids'], [first, second])
+        self.assertEqual(trends['total_count'], [3, 2])
+        self.assertEqual(trends['average_flowrate'], [90.0, 145.0])
+        self.assertEqual(trends['average_pressure'], [4.67, 6.5])
+        self.assertEqual(trends['average_temperature'], [110.0, 125.0])
+        # Types missing from a batch count 0 there
+        self.assertEqual(trends['type_mix'], {'Compressor': [0, 1], 'Pump': [2, 1], 'Valve': [1, 0]})
+
+    def test_limit_keeps_the_latest_points(self):
+        batches = [self.upload(f"P1,Pump,{100 + i},5,110\n") for i in range(3)]
+
+        trends = self.client.get(reverse('batch-trends'), {'limit': 2}).data
+        self.assertEqual(trends['batch_ids'], batches[1:])
+        self.assertEqual(trends['average_flowrate'], [101.0, 102.0])
+
+        self.assertEqual(self.client.get(reverse('batch-trends'), {'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('batch-trends'), {'limit': 'all'}).status_code, 400)
+
+    @override_settings(UPLOAD_HISTORY_LIMIT=2)
+    def test_points_go_with_their_batch(self):
+        batches = [self.upload("P1,Pump,100,5,110\n") for _ in range(3)]
+        self.assertEqual(self.client.get(reverse('batch-trends')).data['batch_ids'], batches[1:])
+
+
+class EquipmentHistoryTests(QueryBudgetTestCase):
+
+    def test_readings_across_batches(self):
+        first = self.upload_csv(HEADER + "P1,Pump,100,5,110\nV1,Valve,50,2,90\n").data['batch_id']
+        self.upload_csv(HEADER + "V1,Valve,55,2,95\n")
+        third = self.upload_csv(HEADER + "P1,Pump,90,4,100\n").data['batch_id']
+
+        response = self.client.get(reverse('equipment-history', args=['P1']))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['equipment_name'], 'P1')
+        self.assertEqual(response.data['points'], 2)
+        self.assertEqual([(h['batch_id'], h['equipment_type'], h['flowrate'], h['pressure'], h['temperature'])
+                          for h in response.data['history']],
+                         [(first, 'Pump', 100.0, 5.0, 110.0), (third, 'Pump', 90.0, 4.0, 100.0)])
+
+    def test_names_are_matched_exactly(self):
+        self.upload_csv(HEADER + "Pump 1-A,Pump,100,5,110\n")
+        self.assertEqual(self.client.get(reverse('equipment-history', args=['Pump 1-A'])).data['points'], 1)
+        self.assertEqual(self.client.get(reverse('equipment-history', args=['pump 1-a'])).status_code, 404)
+
+
+class AnomalyTests(QueryBudgetTestCase):
+
+    def test_group_zscores_match_pandas(self):
+        rng = np.random.default_rng(7)
+        df = pd.DataFrame({'type': rng.integers(0, 5, 500), 'value': rng.normal(10, 3, 500)})
+        grouped = df.groupby('type')['value']
+        expected = (df['value'] - grouped.transform('mean')) / grouped.transform('std')
+
+        zscores = group_zscores(df['value'].to_numpy(), df['type'].to_numpy(), 5)
+        np.testing.assert_allclose(zscores, expected.to_numpy())
+
+    def test_small_or_flat_groups_score_zero(self):
+        values = np.array([1.0, 2.0, 3.0, 10.0, 10.0, 5.0])
+        codes = np.array([0, 0, 0, 1, 1, 2])
+        np.testing.assert_allclose(group_zscores(values, codes, 3), [-1, 0, 1, 0, 0, 0])
+
+    def test_outliers_are_judged_against_their_own_type(self):
+        # 14 pumps at 5 bar and one at 50; valves all run at 50 bar
+        df = pd.DataFrame({
+            'Equipment Name': [f'P{i}' for i in range(15)] + [f'V{i}' for i in range(15)],
+            'Type': ['Pump'] * 15 + ['Valve'] * 15,
+            'Pressure': [5.0] * 14 + [50.0] + [50.0] * 15,
+            'Temperature': [100.0] * 30,
+        })
+        codes, types = factorize_types(df)
+        pressure_z, temperature_z, is_anomaly = flag_anomalies(df, codes, len(types))
+
+        self.assertEqual(df['Equipment Name'][is_anomaly].tolist(), ['P14'])
+        self.assertGreater(pressure_z[14], ANOMALY_ZSCORE_THRESHOLD)
+        self.assertFalse(temperature_z.any())
+
+    def test_anomaly_listing(self):
+        rows = ''.join(f"P{i},Pump,100,5,110\n" for i in range(14)) + "P14,Pump,100,5,300\n"
+        response = self.upload_csv(HEADER + rows)
+        self.assertEqual(response.data['anomaly_count'], 1)
+
+        listing = self.client.get(reverse('batch-anomalies', args=[response.data['batch_id']])).data
+        self.assertEqual(listing['zscore_threshold'], ANOMALY_ZSCORE_THRESHOLD)
+        self.assertEqual([row['equipment_name'] for row in listing['anomalies']], ['P14'])
+        self.assertGreater(listing['anomalies'][0]['temperature_zscore'], ANOMALY_ZSCORE_THRESHOLD)
+
+
+class AlertRuleTests(QueryBudgetTestCase):
+
+    def frame(self):
+        return pd.DataFrame({
+            'Equipment Name': ['P1', 'P2', 'C1', 'C2'],
+            'Type': ['Pump', 'Pump', 'Compressor', 'Compressor'],
+            'Flowrate': [100.0, 120.0, 200.0, 210.0],
+            'Pressure': [5.0, 7.0, 9.0, 10.0],
+            'Temperature': [110.0, 130.0, 150.0, 140.0],
+        })
+
+    def evaluate(self, df, rules, **kwargs):
+        codes, types = factorize_types(df)
+        return [(count, sample) for _, count, sample in evaluate_rules(df, rules, codes, types, **kwargs)]
+
+    def test_operators(self):
+        rules = [AlertRule(field='pressure', operator=op, threshold=7) for op in ['>', '>=', '<', '<=']]
+        self.assertEqual(self.evaluate(self.frame(), rules), [
+            (2, ['C1', 'C2']),
+            (3, ['P2', 'C1', 'C2']),
+            (1, ['P1']),
+            (2, ['P1', 'P2']),
+        ])
+
+    def test_type_scoping(self):
+        rules = [
+            AlertRule(equipment_type='Compressor', field='temperature', operator='>', threshold=100),
+            AlertRule(field='temperature', operator='>', threshold=100),
+            AlertRule(equipment_type='Heater', field='temperature', operator='>', threshold=0),
+        ]
+        self.assertEqual(self.evaluate(self.frame(), rules),
+                         [(2, ['C1', 'C2']), (4, ['P1', 'P2', 'C1', 'C2']), (0, [])])
+
+    def test_counts_span_chunks_and_samples_are_capped(self):
+        df = pd.concat([self.frame()] * 5, ignore_index=True)
+        rule = AlertRule(field='flowrate', operator='>=', threshold=0)
+        with patch('core.analytics.RULE_CHUNK_ROWS', 3):
+            self.assertEqual(self.evaluate(df, [rule], sample_size=5), [(20, ['P1', 'P2', 'C1', 'C2', 'P1'])])
+
+    def test_violations_are_stored_with_the_batch(self):
+        AlertRule.objects.create(owner=self.user, name='hot pump', equipment_type='Pump',
+                                 field='temperature', operator='>', threshold=120)
+        AlertRule.objects.create(owner=self.user, field='pressure', operator='>', threshold=100)
+        AlertRule.objects.create(owner=self.user, field='pressure', operator='>', threshold=0, is_active=False)
+
+        response = self.upload_csv(HEADER + "P1,Pump,100,5,110\nP2,Pump,120,7,130\nC1,Compressor,200,9,150\n")
+        self.assertEqual([(a['rule_label'], a['violation_count'], a['sample_equipment'])
+                          for a in response.data['alerts']], [('hot pump', 1, ['P2'])])
+        batch = self.client.get(reverse('batch-analysis', args=[response.data['batch_id']])).data
+        self.assertEqual([a['rule_label'] for a in batch['alerts']], ['hot pump'])
+
+
+class IngestProfileTests(QueryBudgetTestCase):
+
+    def test_normalize_units(self):
+        df = pd.DataFrame({'Flowrate': [1.0, 2.0], 'Pressure': [14.5038, 100.0], 'Temperature': [212.0, 32.0]})
+        normalize_units(df, {'Flowrate': 'm3/s', 'Pressure': 'psi', 'Temperature': 'F'})
+        np.testing.assert_allclose(df['Flowrate'], [3600, 7200])
+        np.testing.assert_allclose(df['Pressure'], [1.0, 6.894757], rtol=1e-5)
+        np.testing.assert_allclose(df['Temperature'], [100, 0], atol=1e-9)
+
+        df = pd.DataFrame({'Flowrate': [60.0], 'Pressure': [250.0], 'Temperature': [300.0]})
+        normalize_units(df, {'Flowrate': 'L/min', 'Pressure': 'kPa', 'Temperature': 'K'})
+        np.testing.assert_allclose(df.iloc[0], [3.6, 2.5, 26.85])
+
+    def test_upload_through_a_profile(self):
+        IngestProfile.objects.create(
+            owner=self.user, name='north', pressure_unit='kPa', temperature_unit='K',
+            column_map={'Equipment Name': 'Tag', 'Pressure': 'P (kPa)', 'Temperature': 'T (K)'})
+        upload = SimpleUploadedFile('north.csv', b"Tag,Type,Flowrate,P (kPa),T (K),Notes\nP1,Pump,100,500,373.15,ok\n")
+        response = self.client.post(reverse('file-upload'), {'file': upload, 'profile': 'north'}, format='multipart')
+        self.assertEqual(response.status_code, 201, response.data)
+
+        stored = ChemicalEquipment.objects.get(batch_id=response.data['batch_id'])
+        self.assertEqual(stored.equipment_name, 'P1')
+        self.assertAlmostEqual(stored.pressure, 5.0)
+        self.assertAlmostEqual(stored.temperature, 100.0)
+
+    def test_column_map_validation(self):
+        url = reverse('ingest-profile-list')
+        for column_map in [['Pressure'], {'Speed': 'rpm'}, {'Pressure': ' '}, {'Pressure': 'Temperature'}]:
+            response = self.client.post(url, {'name': 'bad', 'column_map': column_map}, format='json')
+            self.assertEqual(response.status_code, 400, column_map)
+            self.assertIn('column_map', response.data['errors'])
+
+
+class RejectedRowTests(QueryBudgetTestCase):
+
+    def test_bad_values_are_reported_by_row(self):
+        response = self.upload_csv(
+            HEADER +
+            "P1,Pump,100,5,110\n"
+            "P2,Pump,fast,5,110\n"
+            "P3,Pump,100,,110\n"
+            "P4,Pump,120,6,115\n"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['statistics']['total_count'], 2)
+        self.assertEqual(response.data['rejected_rows'], 2)
+        self.assertEqual(response.data['error_report'], [
+            {"row": 2, "column": "Flowrate", "value": "fast", "error": "not a number"},
+            {"row": 3, "column": "Pressure", "value": None, "error": "missing value"},
+        ])
+
+        errors = self.client.get(reverse('batch-errors', args=[response.data['batch_id']])).data
+        self.assertEqual(errors['rejected_rows'], 2)
+        self.assertEqual(errors['errors'], response.data['error_report'])
+
+    def test_report_is_capped_but_the_count_is_not(self):
+        rows = "P1,Pump,100,5,110\n" + "P2,Pump,x,y,110\n" * 600
+        with patch('core.ingest.MAX_REPORTED_ERRORS', 50):
+            response = self.upload_csv(HEADER + rows)
+        self.assertEqual(response.data['rejected_rows'], 600)
+        self.assertEqual(len(response.data['error_report']), 50)
+        self.assertEqual(response.data['error_report'][:2], [
+            {"row": 2, "column": "Flowrate", "value": "x", "error": "not a number"},
+            {"row": 2, "column": "Pressure", "value": "y", "error": "not a number"},
+        ])
+
+    def test_unusable_files_are_refused(self):
+        response = self.upload_csv("Equipment Name,Type,Flowrate,Pressure\nP1,Pump,100,5\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Temperature', response.data['error'])
+
+        response = self.upload_csv(HEADER + "P1,Pump,,5,110\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['rejected_rows'], 1)
+        self.assertEqual(UploadBatch.objects.count(), 0)
+
+    @skipUnless(CSV_ENGINE == 'pyarrow', "the C parser pads short rows and ignores extra fields")
+    def test_ragged_and_non_finite_rows_are_rejected(self):
+        response = self.upload_csv(
+            HEADER +
+            "P1,Pump,100,5,110\n"
+            "P2,Pump,100,5\n"
+            "P3,Pump,100,5,110,extra\n"
+            "\n"
+            "P4,Pump,inf,1e400,110\n"
+            '"P5\nnorth",Pump,120,6,115\n'
+            "P6,Valve,90,4,100\n"
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['rejected_rows'], 3)
+        self.assertEqual(response.data['error_report'], [
+            {"row": 2, "column": None, "value": None, "error": "expected 5 fields, found 4"},
+            {"row": 3, "column": None, "value": None, "error": "expected 5 fields, found 6"},
+            {"row": 4, "column": "Flowrate", "value": "inf", "error": "not a finite number"},
+            {"row": 4, "column": "Pressure", "value": "inf", "error": "not a finite number"},
+        ])
+
+        batch_id = response.data['batch_id']
+        self.assertEqual(sorted(ChemicalEquipment.objects.filter(batch_id=batch_id)
+                                .values_list('equipment_name', flat=True)), ['P1', 'P5\nnorth', 'P6'])
+        # Every stored reading is finite, so the batch serializes as JSON
+        self.assertEqual(self.client.get(reverse('batch-analysis', args=[batch_id])).status_code, 200)
+
+
+class PerformanceReportTests(QueryBudgetTestCase):
+
+    def test_report_covers_every_phase(self):
+        batch_id = self.upload_sample()
+        report = self.client.get(reverse('batch-performance', args=[batch_id])).data['performance']
+
+        self.assertEqual([phase['name'] for phase in report['phases']],
+                         ['upload_write', 'csv_parse', 'analysis', 'bulk_insert', 'statistics', 'history_pruning'])
+        self.assertEqual(report['rows'], UploadBatch.objects.get(id=batch_id).equipment_count)
+        self.assertAlmostEqual(report['total_wall_seconds'],
+                               sum(phase['wall_seconds'] for phase in report['phases']), places=5)
+        self.assertNotIn('peak_python_memory_bytes', report)
+
+    @override_settings(INGEST_TRACE_MEMORY=True)
+    def test_memory_is_traced_on_request(self):
+        batch_id = self.upload_sample()
+        report = UploadBatch.objects.get(id=batch_id).performance_report
+        self.assertGreater(report['peak_python_memory_bytes'], 0)
+        self.assertEqual(report['peak_python_memory_bytes'],
+                         max(phase['peak_python_memory_bytes'] for phase in report['phases']))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_phases_feed_the_metrics(self):
+        report = IngestPerformanceReport()
+        with report.phase('csv_parse'):
+            pass
+        report.counters['rows'] = 10
+        self.assertEqual(report.as_dict()['phases'][0]['name'], 'csv_parse')
+        self.assertIn('ingest_phase_duration_seconds_count{phase="csv_parse"}', render_metrics())
+
+
+class RequestProfilingTests(QueryBudgetTestCase):
+
+    def test_disabled_without_a_token(self):
+        for token in ['', 'anything']:
+            response = self.client.get(reverse('upload-history'), HTTP_X_PROFILE_TOKEN=token)
+            self.assertNotIn('X-Profile-Id', response)
+
+    @override_settings(PROFILING_TOKEN='profile-token')
+    def test_only_the_token_turns_it_on(self):
+        self.assertNotIn('X-Profile-Id', self.client.get(reverse('upload-history')))
+        self.assertNotIn('X-Profile-Id', self.client.get(reverse('upload-history'), HTTP_X_PROFILE_TOKEN='wrong'))
+
+        response = self.client.get(reverse('upload-history'), HTTP_X_PROFILE_TOKEN='profile-token')
+        profile_id = response['X-Profile-Id']
+        self.assertTrue((settings.PROFILES_DIR / f'{profile_id}.prof').is_file())
+        summary = self.client.get(reverse('profile-download', args=[f'{profile_id}.sql.json']))
+        log = json.loads(b''.join(summary.streaming_content))
+        self.assertEqual((log['path'], log['status']), (reverse('upload-history'), 200))
+        self.assertEqual(log['query_count'], len(log['queries']))
+
+        response = self.client.get(reverse('upload-history'), {'_profile': 'profile-token'})
+        self.assertIn('X-Profile-Id', response)
+
+    @override_settings(PROFILING_TOKEN='profile-token')
+    def test_one_profiled_request_at_a_time(self):
+        # As if another thread were profiling a request right now
+        with RequestProfilingMiddleware._lock:
+            response = self.client.get(reverse('upload-history'), HTTP_X_PROFILE_TOKEN='profile-token')
+            self.assertEqual(response.status_code, 409)
+            self.assertNotIn('X-Profile-Id', response)
+            # Requests that don't ask for a profile aren't held up
+            self.assertEqual(self.client.get(reverse('upload-history')).status_code, 200)
+        response = self.client.get(reverse('upload-history'), HTTP_X_PROFILE_TOKEN='profile-token')
+        self.assertIn('X-Profile-Id', response)
+
+    @override_settings(PROFILING_TOKEN='profile-token')
+    def test_profiles_are_staff_only(self):
+        User.objects.create_user('other', password='other-password')
+        self.log_in('other', 'other-password')
+        response = self.client.get(reverse('upload-history'), HTTP_X_PROFILE_TOKEN='profile-token')
+        self.assertEqual(self.client.get(reverse('profile-list')).status_code, 403)
+        self.assertEqual(self.client.get(
+            reverse('profile-download', args=[response['X-Profile-Id'] + '.prof'])).status_code, 403)
+
+
+class MetricsEndpointTests(QueryBudgetTestCase):
+
+    def test_disabled_without_a_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(METRICS_TOKEN='scrape-token')
+    def test_requires_the_token(self):
+        self.upload_sample()
+        self.client.credentials()  # they'd replace the Authorization header below
+
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE http_requests_total counter', body)
+        self.assertIn('http_requests_total{view="file-upload",method="POST",status="201"}', body)
+        self.assertIn('ingest_phase_duration_seconds_bucket{phase="csv_parse",le="+Inf"}', body)
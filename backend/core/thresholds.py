@@ -0,0 +1,8 @@
+"""
+Detection thresholds shared by the ingest analytics and the API.
+Kept free of NumPy/pandas so views can report them without loading either.
+"""
+
+# A reading is an outlier when it is this many standard deviations
+# away from the mean of its equipment type
+ANOMALY_ZSCORE_THRESHOLD = 3.0
@@ -0,0 +1,73 @@
+"""
+Measurement units for the equipment readings.
+Everything is stored in the canonical units below; uploads in other units are
+converted at ingest with one multiply-add per column.
+"""
+
+# Unit every reading is stored (and reported) in. Uploads without a profile are
+# stored as they come, in these units. Before ingest profiles existed, the PDF
+# report and the desktop dashboard labelled pressure "Pa" (the README said bar).
+# Only the label changed: no stored reading was converted, so pressures and their
+# trends from before and after compare as they are.
+CANONICAL_UNITS = {
+    'Flowrate': 'm3/h',
+    'Pressure': 'bar',
+    'Temperature': 'C',
+}
+
+# Unit -> (scale, offset) such that canonical = value * scale + offset
+UNIT_CONVERSIONS = {
+    'Flowrate': {
+        'm3/h': (1.0, 0.0),
+        'm3/s': (3600.0, 0.0),
+        'L/min': (0.06, 0.0),
+    },
+    'Pressure': {
+        'bar': (1.0, 0.0),
+        'kPa': (0.01, 0.0),
+        'Pa': (1e-5, 0.0),
+        'psi': (0.0689475729, 0.0),
+    },
+    'Temperature': {
+        'C': (1.0, 0.0),
+        'K': (1.0, -273.15),
+        'F': (5 / 9, -32 * 5 / 9),
+    },
+}
+
+# Display labels, used by the PDF report and returned to clients
+UNIT_LABELS = {
+    'm3/h': 'm³/hr',
+    'm3/s': 'm³/s',
+    'L/min': 'L/min',
+    'bar': 'bar',
+    'kPa': 'kPa',
+    'Pa': 'Pa',
+    'psi': 'psi',
+    'C': '°C',
+    'K': 'K',
+    'F': '°F',
+}
+
+FLOWRATE_UNIT_CHOICES = [(unit, UNIT_LABELS[unit]) for unit in UNIT_CONVERSIONS['Flowrate']]
+PRESSURE_UNIT_CHOICES = [(unit, UNIT_LABELS[unit]) for unit in UNIT_CONVERSIONS['Pressure']]
+TEMPERATURE_UNIT_CHOICES = [(unit, UNIT_LABELS[unit]) for unit in UNIT_CONVERSIONS['Temperature']]
+
+
+def canonical_label(column):
+    """Display label of the unit a column is stored in, e.g. canonical_label('Pressure') -> 'bar'."""
+    return UNIT_LABELS[CANONICAL_UNITS[column]]
+
+
+def normalize_units(df, units):
+    """
+    Convert the reading columns of `df` in place to the canonical units.
+    `units` maps column -> source unit; columns already canonical are left untouched.
+    """
+    for column, unit in units.items():
+        scale, offset = UNIT_CONVERSIONS[column][unit]
+        if scale != 1.0:
+            df[column] *= scale
+        if offset:
+            df[column] += offset
+    return df
@@ -1,11 +1,28 @@
 from django.urls import path
-from .views import FileUploadView, generate_pdf, BatchAnalysisView
+from .views import (
+    FileUploadView, generate_pdf, BatchAnalysisView, TrendView, EquipmentHistoryView, BatchAnomalyView,
+    AlertRuleListView, AlertRuleDetailView, BatchErrorReportView,
+    IngestProfileListView, IngestProfileDetailView, BatchPerformanceView,
+    ProfileListView, ProfileDownloadView, UploadHistoryView
+)
 from .auth_views import RegisterView, LoginView
 
 urlpatterns = [
     path('upload/', FileUploadView.as_view(), name='file-upload'),
+    path('history/', UploadHistoryView.as_view(), name='upload-history'),
     path('export-pdf/<int:batch_id>/', generate_pdf, name='export-pdf'),
     path('batch/<int:batch_id>/', BatchAnalysisView.as_view(), name='batch-analysis'),
+    path('batch/<int:batch_id>/performance/', BatchPerformanceView.as_view(), name='batch-performance'),
+    path('batch/<int:batch_id>/errors/', BatchErrorReportView.as_view(), name='batch-errors'),
+    path('batch/<int:batch_id>/anomalies/', BatchAnomalyView.as_view(), name='batch-anomalies'),
+    path('alert-rules/', AlertRuleListView.as_view(), name='alert-rule-list'),
+    path('alert-rules/<int:rule_id>/', AlertRuleDetailView.as_view(), name='alert-rule-detail'),
+    path('ingest-profiles/', IngestProfileListView.as_view(), name='ingest-profile-list'),
+    path('ingest-profiles/<int:profile_id>/', IngestProfileDetailView.as_view(), name='ingest-profile-detail'),
+    path('trends/', TrendView.as_view(), name='batch-trends'),
+    path('equipment/<str:equipment_name>/history/', EquipmentHistoryView.as_view(), name='equipment-history'),
+    path('profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('profiles/<str:filename>/', ProfileDownloadView.as_view(), name='profile-download'),
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
 ]
\ No newline at end of file
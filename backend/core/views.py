@@ -2,149 +2,530 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
-import pandas as pd
-from .models import UploadBatch, ChemicalEquipment
-from .serializers import UploadBatchSerializer
-from django.http import HttpResponse
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.enums import TA_CENTER
+from rest_framework.decorators import api_view
+from rest_framework.permissions import IsAdminUser
+from .models import UploadBatch, ChemicalEquipment, BatchTrendPoint, AlertRule, AlertViolation, IngestProfile
+from .serializers import (
+    UploadBatchSerializer, UploadHistorySerializer, AlertRuleSerializer, AlertViolationSerializer,
+    IngestProfileSerializer
+)
+from .pagination import UploadHistoryPagination
+from .units import CANONICAL_UNITS, canonical_label
+from .metrics import (
+    IngestPerformanceReport, INGEST_ROWS_TOTAL, INGEST_BYTES_TOTAL, PDF_RENDER_SECONDS,
+    render as render_metrics
+)
+from .ingest import parse_equipment_csv, MissingColumnsError
+from .bulk import insert_equipment
+from .locks import ingest_step
+from .thresholds import ANOMALY_ZSCORE_THRESHOLD
+import hmac
+import json
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.http import HttpResponse, FileResponse
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 class FileUploadView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     # Uses global REST_FRAMEWORK settings: BasicAuthentication + IsAuthenticated
 
     def post(self, request, *args, **kwargs):
-        file_obj = request.FILES.get('file')
-        
-        if not file_obj:
-            return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+        # Per-phase wall/CPU/memory; stored on the batch and fed to /metrics
+        report = IngestPerformanceReport(trace_memory=settings.INGEST_TRACE_MEMORY)
+        try:
+            return self._ingest(request, report)
+        finally:
+            report.stop()
 
-        # 1. Create the Batch entry
-        batch = UploadBatch.objects.create(file=file_obj)
+    def _ingest(self, request, report):
+        # pandas/NumPy load on the first upload, not at startup (see gunicorn.conf.py to preload)
+        from .analytics import factorize_types, type_distribution, flag_anomalies, evaluate_rules
 
-        try:
-            # 2. Read CSV using Pandas
-            df = pd.read_csv(batch.file.path)
-
-            # Basic Validation: Check if required columns exist
-            required_columns = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
-            if not all(col in df.columns for col in required_columns):
-                batch.delete() # Clean up bad upload
-                return Response({"error": f"Missing columns. Required: {required_columns}"}, status=status.HTTP_400_BAD_REQUEST)
-
-            # 3. Process Data & Save to DB
-            equipment_list = []
-            for _, row in df.iterrows():
-                equipment_list.append(ChemicalEquipment(
-                    batch=batch,
-                    equipment_name=row['Equipment Name'],
-                    equipment_type=row['Type'],
-                    flowrate=row['Flowrate'],
-                    pressure=row['Pressure'],
-                    temperature=row['Temperature']
-                ))
+        with report.phase('upload_write'):
+            # Accessing FILES reads the multipart body (the upload itself)
+            file_obj = request.FILES.get('file')
             
-            # Bulk create is much faster than saving one by one
-            ChemicalEquipment.objects.bulk_create(equipment_list)
-
-            # 4. Calculate Statistics (The "Analytics" part)
-            stats = {
-                "total_count": len(df),
-                "average_flowrate": round(df['Flowrate'].mean(), 2),
-                "average_pressure": round(df['Pressure'].mean(), 2),
-                "average_temperature": round(df['Temperature'].mean(), 2),
-                # This counts how many of each Type exist (e.g., {"Pump": 10, "Valve": 5})
-                "type_distribution": df['Type'].value_counts().to_dict()
-            }
-
-            # 5. History Management: Keep only last 5 uploads
-            # Get IDs of all batches, ordered by newest first
-            all_batches = UploadBatch.objects.order_by('-uploaded_at')
-            if all_batches.count() > 5:
-                # Identify the ones to delete (everything after the 5th one)
-                ids_to_delete = all_batches.values_list('id', flat=True)[5:]
-                UploadBatch.objects.filter(id__in=ids_to_delete).delete()
-
-            # 6. Return the analysis
+            if not file_obj:
+                return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Optional ingest profile (by name or id): column mapping + source units
+            profile = None
+            profile_ref = request.data.get('profile')
+            if profile_ref:
+                profiles = IngestProfile.objects.filter(owner=request.user)
+                profile = profiles.filter(name=profile_ref).first()
+                if profile is None and str(profile_ref).isdigit():
+                    profile = profiles.filter(id=profile_ref).first()
+                if profile is None:
+                    return Response({"error": f"Unknown ingest profile: {profile_ref}"}, status=status.HTTP_400_BAD_REQUEST)
+
+            # 1. Create the Batch entry. Writes go through short ingest steps (core.locks);
+            # the file is stored before taking the lock.
+            batch = UploadBatch(owner=request.user, filename=file_obj.name, profile=profile)
+            batch.file.save(file_obj.name, file_obj, save=False)
+            with ingest_step():
+                batch.save()
+        INGEST_BYTES_TOTAL.inc(file_obj.size)
+
+        try:
+            # 2. Parse the CSV with a fixed schema; bad rows are reported, not fatal.
+            # Readings come out converted to the canonical units.
+            with report.phase('csv_parse'):
+                try:
+                    df, rejected_rows, parse_errors = parse_equipment_csv(
+                        batch.file.path,
+                        column_map=profile.column_map if profile else None,
+                        units=profile.units if profile else None
+                    )
+                except MissingColumnsError as e:
+                    self._discard(batch) # Clean up bad upload
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+                if df.empty:
+                    self._discard(batch)
+                    return Response({
+                        "error": "No valid rows in file",
+                        "rejected_rows": rejected_rows,
+                        "error_report": parse_errors
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                if rejected_rows:
+                    batch.rejected_rows = rejected_rows
+                    batch.error_report = parse_errors
+                    with ingest_step():
+                        batch.save(update_fields=['rejected_rows', 'error_report'])
+
+            # 3. Flag outliers per equipment type and evaluate the alert rules
+            # (vectorized over whole columns)
+            with report.phase('analysis'):
+                type_codes, types = factorize_types(df)
+                pressure_z, temperature_z, is_anomaly = flag_anomalies(df, type_codes, len(types))
+
+                # Check the uploader's active alert rules in one vectorized pass
+                rules = list(AlertRule.objects.filter(owner=request.user, is_active=True))
+                rule_results = evaluate_rules(df, rules, type_codes, types)
+
+            # 4. Process Data & Save to DB
+            # COPY FROM STDIN on PostgreSQL, bulk_create elsewhere (see core.bulk)
+            with report.phase('bulk_insert'):
+                insert_counters = insert_equipment(batch, df, pressure_z, temperature_z, is_anomaly)
+
+            # 5. Calculate Statistics (The "Analytics" part)
+            with report.phase('statistics'):
+                stats = {
+                    "total_count": len(df),
+                    "average_flowrate": round(df['Flowrate'].mean(), 2),
+                    "average_pressure": round(df['Pressure'].mean(), 2),
+                    "average_temperature": round(df['Temperature'].mean(), 2),
+                    # This counts how many of each Type exist (e.g., {"Pump": 10, "Valve": 5})
+                    "type_distribution": type_distribution(type_codes, types)
+                }
+
+                with ingest_step():
+                    # Append this batch to the trend series (read by TrendView without rescanning rows)
+                    BatchTrendPoint.from_statistics(batch, stats).save()
+
+                    # Keep the rule hits on the batch
+                    violations = AlertViolation.objects.bulk_create([
+                        AlertViolation(
+                            batch=batch,
+                            rule=rule,
+                            rule_label=str(rule),
+                            violation_count=count,
+                            sample_equipment=sample
+                        )
+                        for rule, count, sample in rule_results
+                        if count
+                    ])
+
+            # 6. History Management: keep each user's newest UPLOAD_HISTORY_LIMIT uploads (0: keep all)
+            with report.phase('history_pruning'):
+                limit = settings.UPLOAD_HISTORY_LIMIT
+                if limit:
+                    with ingest_step():
+                        # Identify the uploader's batches past the limit, newest first
+                        ids_to_delete = list(
+                            UploadBatch.objects.filter(owner=request.user)
+                            .order_by('-uploaded_at', '-id').values_list('id', flat=True)[limit:]
+                        )
+                        if ids_to_delete:
+                            UploadBatch.objects.filter(id__in=ids_to_delete).delete()
+
+            INGEST_ROWS_TOTAL.inc(len(df))
+
+            # Keep the performance report with the batch
+            report.counters.update({
+                "rows": len(df),
+                "bytes": file_obj.size,
+                **insert_counters,
+            })
+            batch.equipment_count = len(df)
+            batch.performance_report = report.as_dict()
+            with ingest_step():
+                batch.save(update_fields=['equipment_count', 'performance_report'])
+
+            # 7. Return the analysis
             return Response({
                 "message": "File processed successfully",
                 "batch_id": batch.id,
-                "statistics": stats
+                "statistics": stats,
+                "units": CANONICAL_UNITS,
+                "anomaly_count": int(is_anomaly.sum()),
+                "rejected_rows": rejected_rows,
+                "error_report": parse_errors,
+                "alerts": AlertViolationSerializer(violations, many=True).data
             }, status=status.HTTP_201_CREATED)
 
         except Exception as e:
-            batch.delete() # Clean up if something crashes
+            self._discard(batch) # Clean up if something crashes
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @staticmethod
+    def _discard(batch):
+        with ingest_step():
+            batch.delete()
+
     def get(self, request, *args, **kwargs):
-        # Fetch the last 5 batches
-        recent_batches = UploadBatch.objects.order_by('-uploaded_at')[:5]
+        # Fetch the last 5 batches (the full history is paginated by UploadHistoryView)
+        recent_batches = UploadBatch.objects.filter(owner=request.user).order_by('-uploaded_at', '-id')[:5]
         
         data = []
         for batch in recent_batches:
             data.append({
                 "id": batch.id,
-                "filename": batch.file.name.split('/')[-1], # Clean filename
+                "filename": batch.filename,
                 "uploaded_at": batch.uploaded_at,
-                "equipment_count": batch.equipments.count()
+                "equipment_count": batch.equipment_count
             })
             
         return Response(data, status=status.HTTP_200_OK)
 
+def parse_history_bound(value):
+    """ISO date or datetime query parameter -> aware datetime (a date means midnight UTC)."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, dt_timezone.utc)
+    return moment
+
+class UploadHistoryView(APIView):
+    """
+    Every retained upload, newest first, one cursor page at a time.
+    Filters: ?uploaded_after= (inclusive) and ?uploaded_before= (exclusive), ISO dates
+    or datetimes, and ?filename= (case-insensitive substring). ?page_size= up to 500.
+    """
+
+    def get(self, request):
+        batches = (UploadBatch.objects.filter(owner=request.user)
+                   .only('id', 'filename', 'uploaded_at', 'equipment_count', 'rejected_rows'))
+
+        try:
+            if request.query_params.get('uploaded_after'):
+                batches = batches.filter(uploaded_at__gte=parse_history_bound(request.query_params['uploaded_after']))
+            if request.query_params.get('uploaded_before'):
+                batches = batches.filter(uploaded_at__lt=parse_history_bound(request.query_params['uploaded_before']))
+        except ValueError as e:
+            return Response({"error": f"Invalid date: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.query_params.get('filename'):
+            batches = batches.filter(filename__icontains=request.query_params['filename'])
+
+        paginator = UploadHistoryPagination()
+        page = paginator.paginate_queryset(batches, request, view=self)
+        return paginator.get_paginated_response(UploadHistorySerializer(page, many=True).data)
+
 class BatchAnalysisView(APIView):
     def get(self, request, batch_id):
         try:
-            batch = UploadBatch.objects.get(id=batch_id)
-            
-            # Recalculate or retrieve stats (for now, let's recalculate simply as we don't store stats in DB yet)
-            # In a production app, you'd store stats in a JSONField or similar
-            
-            equipments = batch.equipments.all()
-            total_count = equipments.count()
-            
-            if total_count == 0:
-                 return Response({"error": "Batch is empty"}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Simple aggregations
-            # Note: For large datasets, doing this in Python is slow. 
-            # Better to use Django aggregates: .aggregate(Avg('flowrate'), ...)
-            
-            from django.db.models import Avg
-            
-            aggregates = equipments.aggregate(
-                avg_flow=Avg('flowrate'),
-                avg_pressure=Avg('pressure'),
-                avg_temp=Avg('temperature')
-            )
-            
-            type_counts = {}
-            for e in equipments:
-                type_counts[e.equipment_type] = type_counts.get(e.equipment_type, 0) + 1
-            
-            stats = {
-                "total_count": total_count,
-                "average_flowrate": round(aggregates['avg_flow'] or 0, 2),
-                "average_pressure": round(aggregates['avg_pressure'] or 0, 2),
-                "average_temperature": round(aggregates['avg_temp'] or 0, 2),
-                "type_distribution": type_counts
-            }
-            
+            # The statistics were computed at ingest and stored with the trend point,
+            # so this reads one row instead of rescanning the batch's equipment
+            batch = UploadBatch.objects.select_related('trend_point').get(id=batch_id, owner=request.user)
+            try:
+                stats = batch.trend_point.as_statistics()
+            except BatchTrendPoint.DoesNotExist:
+                # Still being ingested (or nothing was stored)
+                return Response({"error": "Batch is empty"}, status=status.HTTP_404_NOT_FOUND)
+
             return Response({
                 "batch_id": batch.id,
                 "statistics": stats,
+                "units": CANONICAL_UNITS,
+                "alerts": AlertViolationSerializer(batch.alert_violations.all(), many=True).data,
                 "created_at": batch.uploaded_at
             }, status=status.HTTP_200_OK)
             
         except UploadBatch.DoesNotExist:
             return Response({"error": "Batch not found"}, status=status.HTTP_404_NOT_FOUND)
 
+class BatchPerformanceView(APIView):
+    """Per-phase wall time, CPU time and peak Python memory recorded while the batch was ingested."""
+
+    def get(self, request, batch_id):
+        try:
+            batch = UploadBatch.objects.only('id', 'performance_report').get(id=batch_id, owner=request.user)
+        except UploadBatch.DoesNotExist:
+            return Response({"error": "Batch not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "batch_id": batch.id,
+            "performance": batch.performance_report,
+        }, status=status.HTTP_200_OK)
+
+class BatchErrorReportView(APIView):
+    """Rows of an upload that were rejected at parse time (bad values or wrong number of fields)."""
+
+    def get(self, request, batch_id):
+        try:
+            batch = UploadBatch.objects.only('id', 'rejected_rows', 'error_report').get(id=batch_id, owner=request.user)
+        except UploadBatch.DoesNotExist:
+            return Response({"error": "Batch not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "batch_id": batch.id,
+            "rejected_rows": batch.rejected_rows,
+            "errors": batch.error_report,
+        }, status=status.HTTP_200_OK)
+
+class BatchAnomalyView(APIView):
+    """Rows of a batch flagged as outliers for their equipment type at ingest."""
+
+    def get(self, request, batch_id):
+        if not UploadBatch.objects.filter(id=batch_id, owner=request.user).exists():
+            return Response({"error": "Batch not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        anomalies = list(
+            ChemicalEquipment.objects
+            .filter(batch_id=batch_id, is_anomaly=True)
+            .order_by('id')
+            .values('id', 'equipment_name', 'equipment_type', 'flowrate', 'pressure',
+                    'temperature', 'pressure_zscore', 'temperature_zscore')
+        )
+
+        return Response({
+            "batch_id": batch_id,
+            "zscore_threshold": ANOMALY_ZSCORE_THRESHOLD,
+            "anomaly_count": len(anomalies),
+            "anomalies": anomalies,
+        }, status=status.HTTP_200_OK)
+
+class AlertRuleListView(APIView):
+    """List the requesting user's alert rules or create a new one."""
+
+    def get(self, request):
+        rules = AlertRule.objects.filter(owner=request.user).order_by('id')
+        return Response(AlertRuleSerializer(rules, many=True).data, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        serializer = AlertRuleSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save(owner=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class AlertRuleDetailView(APIView):
+    """Read, update (full or partial) or delete one of the requesting user's alert rules."""
+
+    def get(self, request, rule_id):
+        try:
+            rule = AlertRule.objects.get(id=rule_id, owner=request.user)
+        except AlertRule.DoesNotExist:
+            return Response({"error": "Rule not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(AlertRuleSerializer(rule).data, status=status.HTTP_200_OK)
+
+    def put(self, request, rule_id, partial=False):
+        try:
+            rule = AlertRule.objects.get(id=rule_id, owner=request.user)
+        except AlertRule.DoesNotExist:
+            return Response({"error": "Rule not found"}, status=status.HTTP_404_NOT_FOUND)
+        serializer = AlertRuleSerializer(rule, data=request.data, partial=partial)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def patch(self, request, rule_id):
+        return self.put(request, rule_id, partial=True)
+
+    def delete(self, request, rule_id):
+        deleted, _ = AlertRule.objects.filter(id=rule_id, owner=request.user).delete()
+        if not deleted:
+            return Response({"error": "Rule not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class IngestProfileListView(APIView):
+    """List the requesting user's column-mapping / unit profiles or create a new one."""
+
+    def get(self, request):
+        profiles = IngestProfile.objects.filter(owner=request.user).order_by('name')
+        return Response(IngestProfileSerializer(profiles, many=True).data, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        serializer = IngestProfileSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save(owner=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+class IngestProfileDetailView(APIView):
+    """Read, update (full or partial) or delete one of the requesting user's ingest profiles."""
+
+    def get(self, request, profile_id):
+        try:
+            profile = IngestProfile.objects.get(id=profile_id, owner=request.user)
+        except IngestProfile.DoesNotExist:
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(IngestProfileSerializer(profile).data, status=status.HTTP_200_OK)
+
+    def put(self, request, profile_id, partial=False):
+        try:
+            profile = IngestProfile.objects.get(id=profile_id, owner=request.user)
+        except IngestProfile.DoesNotExist:
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        serializer = IngestProfileSerializer(profile, data=request.data, partial=partial, context={'request': request})
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def patch(self, request, profile_id):
+        return self.put(request, profile_id, partial=True)
+
+    def delete(self, request, profile_id):
+        deleted, _ = IngestProfile.objects.filter(id=profile_id, owner=request.user).delete()
+        if not deleted:
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ProfileListView(APIView):
+    """Request profiles saved by RequestProfilingMiddleware, newest first (staff only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        profiles = []
+        profiles_dir = settings.PROFILES_DIR
+        if profiles_dir.is_dir():
+            for sql_log in sorted(profiles_dir.glob('*.sql.json'), reverse=True):
+                profile_id = sql_log.name[:-len('.sql.json')]
+                with open(sql_log) as f:
+                    summary = json.load(f)
+                profiles.append({
+                    "id": profile_id,
+                    "path": summary.get("path"),
+                    "method": summary.get("method"),
+                    "status": summary.get("status"),
+                    "wall_seconds": summary.get("wall_seconds"),
+                    "query_count": summary.get("query_count"),
+                    "files": [f"{profile_id}.prof", f"{profile_id}.sql.json"],
+                })
+        return Response(profiles, status=status.HTTP_200_OK)
+
+class ProfileDownloadView(APIView):
+    """Download one saved profile file (.prof for pstats/snakeviz, .sql.json for the query log)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, filename):
+        # Only plain names written by the middleware; nothing that could leave PROFILES_DIR
+        if not re.fullmatch(r'[A-Za-z0-9-]+\.(prof|sql\.json)', filename):
+            return Response({"error": "Invalid profile name"}, status=status.HTTP_400_BAD_REQUEST)
+        path = settings.PROFILES_DIR / filename
+        if not path.is_file():
+            return Response({"error": "Profile not found"}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename)
+
+class TrendView(APIView):
+    """
+    Time series of the batch-level metrics across the user's retained batches.
+    Reads only the BatchTrendPoint table, one small row per batch, through trend_owner_time_idx.
+    Optional ?limit=N returns only the N most recent points.
+    """
+
+    def get(self, request):
+        points = BatchTrendPoint.objects.filter(owner=request.user).order_by('-uploaded_at', '-id')
+
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+            if limit < 1:
+                return Response({"error": "limit must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+            points = points[:limit]
+
+        rows = list(points.values_list(
+            'batch_id', 'uploaded_at', 'total_count', 'average_flowrate',
+            'average_pressure', 'average_temperature', 'type_distribution'
+        ))
+        rows.reverse()  # Oldest first, as a time series
+
+        # Every type gets one value per point (0 when absent from that batch)
+        type_names = sorted({name for row in rows for name in row[6]})
+        type_mix = {name: [row[6].get(name, 0) for row in rows] for name in type_names}
+
+        return Response({
+            "points": len(rows),
+            "batch_ids": [row[0] for row in rows],
+            "timestamps": [row[1] for row in rows],
+            "total_count": [row[2] for row in rows],
+            "average_flowrate": [row[3] for row in rows],
+            "average_pressure": [row[4] for row in rows],
+            "average_temperature": [row[5] for row in rows],
+            "type_mix": type_mix,
+        }, status=status.HTTP_200_OK)
+
+class EquipmentHistoryView(APIView):
+    """
+    Flowrate, pressure and temperature of one equipment across the user's retained batches.
+    Served by the (equipment_name, batch) index, so the lookup does not scan other rows.
+    """
+
+    def get(self, request, equipment_name):
+        readings = (
+            ChemicalEquipment.objects
+            .filter(equipment_name=equipment_name, batch__owner=request.user)
+            .order_by('batch_id', 'id')  # Batch ids grow with upload time
+            .values('batch_id', 'batch__uploaded_at', 'equipment_type',
+                    'flowrate', 'pressure', 'temperature')
+        )
+
+        history = [{
+            "batch_id": r['batch_id'],
+            "uploaded_at": r['batch__uploaded_at'],
+            "equipment_type": r['equipment_type'],
+            "flowrate": r['flowrate'],
+            "pressure": r['pressure'],
+            "temperature": r['temperature'],
+        } for r in readings]
+
+        if not history:
+            return Response({"error": "Equipment not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "equipment_name": equipment_name,
+            "points": len(history),
+            "history": history,
+        }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
 def generate_pdf(request, batch_id):
+    # Through DRF so the default authentication and IsAuthenticated apply.
+    # ReportLab loads on the first export, not at startup.
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
     try:
-        batch = UploadBatch.objects.get(id=batch_id)
+        batch = UploadBatch.objects.select_related('trend_point').get(id=batch_id, owner=request.user)
         equipments = batch.equipments.all()
         
         # Create the HttpResponse object with PDF headers
@@ -181,22 +562,19 @@ def generate_pdf(request, batch_id):
         elements.append(subtitle)
         elements.append(Spacer(1, 0.3*inch))
         
-        # Calculate statistics
-        from django.db.models import Avg
-        total = equipments.count()
-        aggregates = equipments.aggregate(
-            avg_flow=Avg('flowrate'),
-            avg_pressure=Avg('pressure'),
-            avg_temp=Avg('temperature')
-        )
+        # Statistics stored at ingest (see BatchAnalysisView)
+        try:
+            stats = batch.trend_point.as_statistics()
+        except BatchTrendPoint.DoesNotExist:
+            return HttpResponse("Batch is empty", status=404)
         
         # Summary Statistics Table
         summary_data = [
             ['Metric', 'Value'],
-            ['Total Equipment', str(total)],
-            ['Average Flowrate', f"{round(aggregates['avg_flow'] or 0, 2)} m³/hr"],
-            ['Average Pressure', f"{round(aggregates['avg_pressure'] or 0, 2)} Pa"],
-            ['Average Temperature', f"{round(aggregates['avg_temp'] or 0, 2)} °C"],
+            ['Total Equipment', str(stats['total_count'])],
+            ['Average Flowrate', f"{stats['average_flowrate']} {canonical_label('Flowrate')}"],
+            ['Average Pressure', f"{stats['average_pressure']} {canonical_label('Pressure')}"],
+            ['Average Temperature', f"{stats['average_temperature']} {canonical_label('Temperature')}"],
         ]
         
         summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
@@ -251,17 +629,63 @@ def generate_pdf(request, batch_id):
         elements.append(equipment_table)
         
         # Add note if data was limited
-        if total > equipment_limit:
+        if stats['total_count'] > equipment_limit:
             elements.append(Spacer(1, 0.2*inch))
             note = Paragraph(
-                f"<i>Note: Showing first {equipment_limit} of {total} total equipment items.</i>",
+                f"<i>Note: Showing first {equipment_limit} of {stats['total_count']} total equipment items.</i>",
                 styles['Normal']
             )
             elements.append(note)
         
+        # Alert Violations Section (rules evaluated at ingest)
+        violations = list(batch.alert_violations.all())
+        if violations:
+            elements.append(Spacer(1, 0.4*inch))
+            elements.append(Paragraph("<b>Alert Violations</b>", styles['Heading2']))
+            elements.append(Spacer(1, 0.2*inch))
+            
+            alert_data = [['Rule', 'Violations', 'Example Equipment']]
+            for v in violations:
+                alert_data.append([
+                    v.rule_label,
+                    str(v.violation_count),
+                    ', '.join(v.sample_equipment[:3])
+                ])
+            
+            alert_table = Table(alert_data, colWidths=[2.5*inch, 1*inch, 2.5*inch])
+            alert_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ca3214')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+            ]))
+            elements.append(alert_table)
+        
         # Build PDF
-        doc.build(elements)
+        with PDF_RENDER_SECONDS.time():
+            doc.build(elements)
         return response
         
     except UploadBatch.DoesNotExist:
-        return HttpResponse("Batch not found", status=404)
\ No newline at end of file
+        return HttpResponse("Batch not found", status=404)
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint: request, ingest and report metrics of this worker process.
+    Disabled (404) unless METRICS_TOKEN is set; scrapers send it as `Authorization: Bearer <token>`.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        return HttpResponse("Not found", status=404)
+    scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(supplied.strip(), token):
+        response = HttpResponse("Unauthorized", status=401)
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for production (read automatically by `gunicorn config.wsgi`
+when started from backend/). benchmarks/loadtest.py runs the app with these too.
+"""
+import importlib
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+
+# Large CSV uploads are parsed and inserted inside the request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+
+# The app loads pandas, NumPy, pyarrow and ReportLab lazily, on the first upload or
+# PDF export, so workers start fast (scale-to-zero, restarts). With
+# GUNICORN_PRELOAD=1 the master loads the app and these libraries once before
+# forking: workers then share the memory and their first upload/export is not slower.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0') == '1'
+
+PRELOAD_MODULES = ['core.analytics', 'core.ingest', 'pyarrow.csv', 'reportlab.platypus']
+
+
+def on_starting(server):
+    if server.cfg.preload_app:
+        for name in PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                server.log.warning("preload: %s is not installed", name)
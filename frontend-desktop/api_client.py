@@ -1,10 +1,63 @@
 import os
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+from cache import ResponseCache
+from cancellation import RequestCancelled
+from multipart import MultipartFileStream
+
 # Load environment variables
 load_dotenv()
 
+
+# Connections kept alive to the server; enough for every worker thread (workers.TaskRunner)
+# plus the prefetch threads
+POOL_SIZE = 8
+
+# Batch statistics fetched at once by prefetch_batch_stats()
+PREFETCH_WORKERS = 4
+
+# Failed connections are retried for every call (the request never reached the server).
+# Reads are retried with backoff (0.5 s, 1 s, 2 s) on errors and 502/503/504, e.g.
+# while a scaled-to-zero backend starts; uploads (POST) are not resent.
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+    raise_on_status=False,
+)
+
+
+def create_session():
+    """A requests Session with a keep-alive connection pool and the retry policy."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=RETRY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # requests asks for gzip/deflate by default; the server compresses its JSON and PDFs
+    return session
+
+
+def open_response_cache():
+    """
+    The on-disk response cache, or an in-memory one for this session when the
+    cache directory can't be created or written (read-only home, sandbox).
+    """
+    try:
+        return ResponseCache()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Response cache unavailable ({e}); caching in memory for this session")
+        return ResponseCache(path=':memory:')
+
+
 class APIClient:
     def __init__(self):
         self.base_url = os.getenv("API_URL", "http://127.0.0.1:8000")
@@ -12,9 +65,27 @@ class APIClient:
         if self.base_url.endswith("/"):
             self.base_url = self.base_url[:-1]
         
+        # One pooled session for all calls: connections (and TLS) are reused
+        self.session = create_session()
+        
         # Credentials storage
         self._username = None
         self._password = None
+        
+        # History fetched by test_auth(), handed to the first get_recent_uploads()
+        self._prefetched_uploads = None
+        
+        # Upload throttle in bytes/second (0: unlimited)
+        self.upload_rate_limit = int(os.getenv("UPLOAD_MAX_KBPS", "0")) * 1024
+        
+        # Batch statistics, plus the last-seen history for offline use (see cache.py)
+        self.cache = open_response_cache()
+        
+        # Batch statistics in memory for this session, and fetches in flight (a click
+        # on a batch being prefetched waits for that request instead of sending another)
+        self._batch_stats = {}
+        self._batch_stats_inflight = {}
+        self._batch_stats_lock = threading.Lock()
     
     def set_credentials(self, username, password):
         """Store credentials for authenticated requests."""
@@ -25,6 +96,7 @@ class APIClient:
         """Clear stored credentials."""
         self._username = None
         self._password = None
+        self._prefetched_uploads = None
     
     def get_auth(self):
         """Get auth tuple if credentials are set."""
@@ -36,32 +108,45 @@ class APIClient:
         """
         Test if the stored credentials are valid.
         Returns True if authentication succeeds, False otherwise.
+        The check fetches the upload history, which the dashboard then shows
+        without requesting it again.
         """
         try:
-            # Try to access the upload endpoint with OPTIONS or a simple GET
             test_url = f"{self.base_url}/api/upload/"
-            response = requests.options(test_url, auth=self.get_auth(), timeout=10)
+            response = self.session.get(test_url, auth=self.get_auth(), timeout=10)
+            if response.status_code == 200:
+                self._prefetched_uploads = response.json()
+                self._cache_put('recent_uploads', '', self._prefetched_uploads)
             # If we get anything other than 401, credentials are likely valid
             return response.status_code != 401
         except requests.exceptions.RequestException:
             # If we can't connect, assume it's a network issue, not auth
             return True  # Let the actual upload reveal the real error
 
-    def upload_csv(self, file_path):
+    def upload_csv(self, file_path, profile=None, progress=None, cancel=None):
         """
         Uploads a CSV file to the /api/upload/ endpoint.
+        `profile` optionally names a saved ingest profile (column mapping + units).
+        The file is streamed from disk (see multipart.py): `progress(bytes_sent, bytes_total)`
+        follows the request body, and a set `cancel` token aborts the upload with
+        RequestCancelled. UPLOAD_MAX_KBPS in the environment caps the upload rate.
         Returns the JSON response containing statistics and batch_id.
         """
         upload_url = f"{self.base_url}/api/upload/"
+        fields = {'profile': profile} if profile else None
         
         try:
-            with open(file_path, 'rb') as f:
-                files = {'file': (os.path.basename(file_path), f, 'text/csv')}
-                response = requests.post(upload_url, files=files, auth=self.get_auth())
+            with MultipartFileStream('file', file_path, 'text/csv', fields=fields, progress=progress,
+                                     cancel=cancel, max_bytes_per_second=self.upload_rate_limit) as body:
+                # No read timeout: the server answers once it has processed the whole file
+                response = self.session.post(upload_url, data=body, headers={'Content-Type': body.content_type},
+                                             auth=self.get_auth(), timeout=(10, None))
                 
             response.raise_for_status()
             return response.json()
             
+        except RequestCancelled:
+            raise
         except requests.exceptions.RequestException as e:
             print(f"API Request Error: {e}")
             raise e
@@ -73,13 +158,23 @@ class APIClient:
         """
         Fetch the last 5 recent uploads from the server.
         Returns a list of upload data with id, filename, uploaded_at, equipment_count.
+        When the server can't be reached, returns the last list fetched (empty if none).
         """
+        if self._prefetched_uploads is not None:
+            uploads, self._prefetched_uploads = self._prefetched_uploads, None
+            return uploads
+        
         upload_url = f"{self.base_url}/api/upload/"
         
         try:
-            response = requests.get(upload_url, auth=self.get_auth(), timeout=10)
+            response = self.session.get(upload_url, auth=self.get_auth(), timeout=10)
             response.raise_for_status()
-            return response.json()
+            uploads = response.json()
+            self._cache_put('recent_uploads', '', uploads)
+            return uploads
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print(f"API Request Error: {e}")
+            return self._cache_get('recent_uploads', '') or []
         except requests.exceptions.RequestException as e:
             print(f"API Request Error: {e}")
             return []
@@ -91,34 +186,141 @@ class APIClient:
         """
         Fetch statistics for a specific batch.
         Returns the batch statistics including type distribution.
+        A batch never changes once ingested, so a cached copy is returned without a request,
+        and a fetch of the same batch already in flight (e.g. a prefetch) is waited for.
         """
+        cached = self.cached_batch_stats(batch_id)
+        if cached is not None:
+            return cached
+        
+        key = self._batch_key(batch_id)
+        with self._batch_stats_lock:
+            pending = self._batch_stats_inflight.get(key)
+            if pending is None:
+                future = self._batch_stats_inflight[key] = Future()
+        if pending is not None:
+            return pending.result()
+        
         stats_url = f"{self.base_url}/api/batch/{batch_id}/"
         
         try:
-            response = requests.get(stats_url, auth=self.get_auth(), timeout=10)
+            try:
+                response = self.session.get(stats_url, auth=self.get_auth(), timeout=10)
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                print(f"API Request Error: {e}")
+                raise e
+            self._batch_stats[key] = data
+            self._cache_put('batch_stats', batch_id, data)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._batch_stats_lock:
+                del self._batch_stats_inflight[key]
+
+    def prefetch_batch_stats(self, batch_ids, cancel=None):
+        """
+        Fetch the statistics of `batch_ids` not cached yet, PREFETCH_WORKERS at a time,
+        so that opening any of them needs no request. Failures are left for the
+        click to retry; a set `cancel` token stops starting new fetches.
+        Returns the number of batches fetched.
+        """
+        missing = [batch_id for batch_id in batch_ids if self.cached_batch_stats(batch_id) is None]
+        if not missing:
+            return 0
+        
+        def fetch(batch_id):
+            if cancel is not None and cancel.cancelled:
+                return False
+            try:
+                self.get_batch_stats(batch_id)
+                return True
+            except requests.exceptions.RequestException:
+                return False
+        
+        with ThreadPoolExecutor(max_workers=min(PREFETCH_WORKERS, len(missing)), thread_name_prefix='prefetch') as pool:
+            return sum(pool.map(fetch, missing))
+
+    def get_equipment_history(self, equipment_name):
+        """
+        Fetch one equipment's readings across all batches.
+        Returns the history payload with flowrate, pressure and temperature per batch.
+        When the server can't be reached, returns the last copy fetched, if any.
+        """
+        history_url = f"{self.base_url}/api/equipment/{quote(equipment_name, safe='')}/history/"
+        
+        try:
+            response = self.session.get(history_url, auth=self.get_auth(), timeout=10)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self._cache_put('equipment_history', equipment_name, data)
+            return data
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            cached = self._cache_get('equipment_history', equipment_name)
+            if cached is None:
+                print(f"API Request Error: {e}")
+                raise e
+            return cached
         except requests.exceptions.RequestException as e:
             print(f"API Request Error: {e}")
             raise e
 
-    def download_pdf(self, batch_id, save_path):
+    def cached_batch_stats(self, batch_id):
+        """The cached statistics of a batch (as get_batch_stats returns them), or None. No request is made."""
+        key = self._batch_key(batch_id)
+        data = self._batch_stats.get(key)
+        if data is None:
+            data = self._cache_get('batch_stats', batch_id)
+            if data is not None:
+                self._batch_stats[key] = data
+        return data
+
+    def _batch_key(self, batch_id):
+        return (self.base_url, self._username, str(batch_id))
+
+    def _cache_get(self, kind, key):
+        return self.cache.get(self.base_url, self._username, kind, key)
+
+    def _cache_put(self, kind, key, value):
+        self.cache.put(self.base_url, self._username, kind, key, value)
+
+    def download_pdf(self, batch_id, save_path, progress=None, cancel=None):
         """
         Download PDF report for a specific batch.
         Saves the PDF to the specified path.
+        `progress(bytes_received, bytes_total)` is called per chunk (total is None when the
+        server sends no length); a set `cancel` token stops the download, removes the
+        partial file and raises RequestCancelled.
         Returns True on success, False on failure.
         """
         pdf_url = f"{self.base_url}/api/export-pdf/{batch_id}/"
         
         try:
-            response = requests.get(pdf_url, auth=self.get_auth(), timeout=30, stream=True)
-            response.raise_for_status()
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with self.session.get(pdf_url, auth=self.get_auth(), timeout=30, stream=True) as response:
+                response.raise_for_status()
+                # Content-Length counts the bytes on the wire (compressed if gzip), so does raw.tell()
+                total = int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+                
+                try:
+                    with open(save_path, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=8192):
+                            if cancel is not None:
+                                cancel.raise_if_cancelled()
+                            f.write(chunk)
+                            if progress is not None:
+                                progress(response.raw.tell(), total)
+                except RequestCancelled:
+                    os.remove(save_path)
+                    raise
             
             return True
+        except RequestCancelled:
+            raise
         except requests.exceptions.RequestException as e:
             print(f"PDF Download Error: {e}")
             raise e
@@ -0,0 +1,108 @@
+"""
+Redraw latency of the type distribution charts, from 10 to 1000 equipment types.
+
+Each stats change is timed until the bar and pie charts are painted, for:
+  full redraw  - axes.clear() and re-plot with Axes.bar/Axes.pie, then draw()
+                 (what the dashboard did before ui/charts.py)
+  in place     - TypeBarChart/TypePieChart updating their artists, every type drawn
+  with Other   - the same, folding types past CHART_MAX_TYPES into "Other" (the default)
+Consecutive updates alternate between two distributions with the same types,
+as when clicking between batches. Runs offscreen; no server needed.
+
+Usage:
+    python bench_charts.py [--types 10 100 1000] [--rounds 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from theme import Theme
+from ui.charts import MAX_TYPES, PALETTE, MplCanvas, TypeBarChart, TypePieChart
+
+
+def distribution(n_types, seed):
+    rng = random.Random(seed)
+    counts = sorted((rng.randint(1, 1000) for _ in range(n_types)), reverse=True)
+    return {f"Type-{i}": count for i, count in enumerate(counts)}
+
+
+def full_redraw(bar_canvas, pie_canvas, type_dist):
+    labels, values = list(type_dist), list(type_dist.values())
+    bar_canvas.axes.clear()
+    bar_canvas.axes.bar(labels, values, color=Theme.CHART_1, alpha=0.9)
+    bar_canvas.axes.set_title("Count per Type", color=Theme.FOREGROUND, fontsize=12, fontweight='bold')
+    bar_canvas.axes.tick_params(colors=Theme.FOREGROUND, labelcolor=Theme.FOREGROUND, axis='x', rotation=45)
+    bar_canvas.fig.subplots_adjust(bottom=0.25)
+    bar_canvas.draw()
+
+    pie_canvas.axes.clear()
+    pie_canvas.axes.pie(values, labels=labels, autopct='%1.1f%%',
+                        colors=[PALETTE[i % len(PALETTE)] for i in range(len(values))],
+                        textprops={'color': Theme.FOREGROUND},
+                        wedgeprops={'edgecolor': Theme.CARD, 'linewidth': 1})
+    pie_canvas.axes.set_title("Type Share", color=Theme.FOREGROUND, fontsize=12, fontweight='bold')
+    pie_canvas.draw()
+
+
+def in_place(app, charts, type_dist):
+    for chart in charts:
+        chart.update(type_dist)
+    # draw_idle() paints on the next event loop pass
+    app.processEvents()
+
+
+def time_updates(update, dists, rounds):
+    update(dists[1])  # warm-up: creates the artists
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        update(dists[i % 2])
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--types', type=int, nargs='+', default=[10, 50, 100, 500, 1000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    def canvases():
+        pair = MplCanvas(width=5, height=4), MplCanvas(width=5, height=4)
+        for canvas in pair:
+            canvas.resize(500, 400)
+            canvas.show()
+        return pair
+
+    header = f"{'types':>6}{'full redraw':>14}{'in place':>12}{'with Other':>13}"
+    print(f"median of {args.rounds} updates, bar + pie, Other above {MAX_TYPES} types\n")
+    print(header)
+    print('-' * len(header))
+    for n_types in args.types:
+        dists = [distribution(n_types, seed) for seed in (1, 2)]
+
+        bar_canvas, pie_canvas = canvases()
+        full = time_updates(lambda d: full_redraw(bar_canvas, pie_canvas, d), dists, args.rounds)
+
+        bar_canvas, pie_canvas = canvases()
+        charts = [TypeBarChart(bar_canvas, max_types=0), TypePieChart(pie_canvas, max_types=0)]
+        unfolded = time_updates(lambda d: in_place(app, charts, d), dists, args.rounds)
+
+        bar_canvas, pie_canvas = canvases()
+        charts = [TypeBarChart(bar_canvas), TypePieChart(pie_canvas)]
+        folded = time_updates(lambda d: in_place(app, charts, d), dists, args.rounds)
+
+        print(f"{n_types:>6}{full * 1000:>12.1f}ms{unfolded * 1000:>10.1f}ms{folded * 1000:>11.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
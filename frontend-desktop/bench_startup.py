@@ -0,0 +1,71 @@
+"""
+Time to first window of the desktop app.
+
+Starts `main.py` in a fresh interpreter (offscreen) --runs times and reports,
+from process start, when the main window is shown and when the login dialog is
+shown and ready for input (the app exits there). No server needed.
+
+Usage:
+    python bench_startup.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+DESKTOP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs main.py, printing a timestamp as each window is shown
+CHILD = f"""
+import os, runpy, sys, time
+sys.path.insert(0, {DESKTOP_DIR!r})
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QDialog, QMainWindow
+
+def stamp(name):
+    print(name, time.time(), flush=True)
+
+def on_show(cls, name, then=None):
+    original = cls.showEvent
+    def showEvent(self, event):
+        original(self, event)
+        stamp(name)
+        if then:
+            # Once the dialog is up and the event loop is idle again
+            QTimer.singleShot(0, then)
+    cls.showEvent = showEvent
+
+on_show(QMainWindow, 'main_window')
+on_show(QDialog, 'login_dialog', then=lambda: (stamp('idle'), os._exit(0)))
+runpy.run_path({os.path.join(DESKTOP_DIR, 'main.py')!r}, run_name='__main__')
+"""
+
+
+def run_once():
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    start = time.time()
+    output = subprocess.run([sys.executable, '-c', CHILD], cwd=DESKTOP_DIR, env=env,
+                            capture_output=True, text=True, timeout=60).stdout
+    stamps = dict(line.split() for line in output.splitlines() if line.count(' ') == 1)
+    return {name: float(stamp) - start for name, stamp in stamps.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    run_once()  # warm the OS file cache
+    runs = [run_once() for _ in range(args.runs)]
+    for name, label in (('main_window', 'main window shown'), ('login_dialog', 'login dialog shown'),
+                        ('idle', 'login dialog ready')):
+        timings = [run[name] for run in runs if name in run]
+        if len(timings) < len(runs):
+            sys.exit(f"{label}: missing in {len(runs) - len(timings)} of {len(runs)} runs")
+        print(f"{label:<20} median {statistics.median(timings) * 1000:7.1f} ms   max {max(timings) * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+On-disk cache of API responses, so the desktop app can reopen data without the network.
+
+Batch statistics never change once a batch is ingested: they are served from
+the cache whenever present, and switching between history items doesn't wait
+for the server. The upload history and equipment histories do change; they are
+stored on every successful fetch and only read back when the server can't be
+reached, so the last-seen data stays viewable offline.
+
+Entries live in one SQLite file in the user's cache directory, keyed by server
+URL, user, kind and key (so accounts and servers never see each other's data),
+and the least recently used ones are evicted once the file holds more than
+DESKTOP_CACHE_MAX_MB of responses (default 50; 0 disables the cache).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import platformdirs
+
+APP_NAME = "ChemicalEquipmentAnalytics"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    server TEXT NOT NULL,
+    username TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (server, username, kind, key)
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def default_cache_path():
+    return os.path.join(platformdirs.user_cache_dir(APP_NAME, appauthor=False), "responses.sqlite3")
+
+
+class ResponseCache:
+    """
+    JSON responses by (server, username, kind, key), with LRU eviction past `max_bytes`.
+    Safe to use from the worker threads (one connection behind a lock).
+    A write that fails (read-only file, full disk) is skipped: the cache never fails a request.
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("DESKTOP_CACHE_MAX_MB", "50")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+        self._db = None
+        if self.enabled:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Several app windows may share the file: wait for each other's writes
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._db.executescript(SCHEMA)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, server, username, kind, key):
+        """The cached value, or None. A hit makes the entry the most recently used."""
+        if not self.enabled:
+            return None
+        entry = (server, username or '', kind, str(key))
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM entries WHERE server = ? AND username = ? AND kind = ? AND key = ?", entry
+            ).fetchone()
+            if row is None:
+                return None
+            try:
+                self._db.execute(
+                    "UPDATE entries SET last_used = ? WHERE server = ? AND username = ? AND kind = ? AND key = ?",
+                    (time.time(), *entry)
+                )
+            except sqlite3.OperationalError:
+                pass  # read-only: the hit is still served, just not moved up the LRU order
+        return json.loads(row[0])
+
+    def put(self, server, username, kind, key, value):
+        """Store `value` (JSON-serialisable), then evict the oldest entries beyond the size limit."""
+        if not self.enabled:
+            return
+        data = json.dumps(value)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                return  # read-only or locked by another window past the timeout: skip
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (server, username or '', kind, str(key), data, len(data), time.time())
+                )
+                self._evict()
+                self._db.execute("COMMIT")
+            except sqlite3.OperationalError:
+                self._db.execute("ROLLBACK")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _evict(self):
+        total, = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        # Walk from the least recently used until enough is freed
+        excess, cutoff = total - self.max_bytes, None
+        for last_used, size in self._db.execute("SELECT last_used, size FROM entries ORDER BY last_used"):
+            excess -= size
+            cutoff = last_used
+            if excess <= 0:
+                break
+        self._db.execute("DELETE FROM entries WHERE last_used <= ?", (cutoff,))
+
+    def clear(self):
+        if self.enabled:
+            with self._lock:
+                self._db.execute("DELETE FROM entries")
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
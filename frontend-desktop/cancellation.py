@@ -0,0 +1,30 @@
+"""
+Cancelling a request from another thread.
+
+The GUI thread sets a CancelToken; the code doing the request (APIClient,
+MultipartFileStream) polls it and stops by raising RequestCancelled. Kept free
+of Qt and requests so either side can import it cheaply.
+"""
+import threading
+
+
+class RequestCancelled(Exception):
+    """The caller cancelled the request (see CancelToken)."""
+
+
+class CancelToken:
+    """Set by the GUI thread, polled by the worker."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise RequestCancelled()
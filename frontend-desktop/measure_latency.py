@@ -0,0 +1,82 @@
+"""
+Per-call latency of the desktop client against a backend (API_URL from .env by
+default, e.g. the hosted one).
+
+Each APIClient call is timed --calls times over the pooled keep-alive session,
+then again opening a new connection for every call (as module-level
+requests.get/post did), and p50/p95 are printed for both. Read-only calls only,
+unless --upload is given (which adds batches to the account).
+
+Usage:
+    python measure_latency.py --username alice --password ... [--url https://host] [--calls 20]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from api_client import APIClient
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(q / 100 * (len(values) - 1)))]
+
+
+def time_calls(client, fn, calls, fresh_connections):
+    timings = []
+    for _ in range(calls):
+        if fresh_connections:
+            client.session.close()  # drop the pooled connections: next call reconnects
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='backend URL (default: API_URL)')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', default=os.getenv('API_PASSWORD'), help='default: $API_PASSWORD')
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--equipment', default='Pump-1', help='equipment name for the history call')
+    parser.add_argument('--upload', metavar='CSV', help='also time uploads of this file')
+    args = parser.parse_args()
+
+    client = APIClient()
+    if args.url:
+        client.base_url = args.url.rstrip('/')
+    client.set_credentials(args.username, args.password)
+    if not client.test_auth():
+        parser.error("authentication failed")
+
+    uploads = client.get_recent_uploads() or client.get_recent_uploads()
+    pdf_path = os.path.join(tempfile.mkdtemp(), 'report.pdf')
+    calls = {
+        'login check': client.test_auth,
+        'recent uploads': client.get_recent_uploads,
+        'equipment history': lambda: client.get_equipment_history(args.equipment),
+    }
+    if uploads:
+        batch_id = uploads[0]['id']
+        calls['batch stats'] = lambda: client.get_batch_stats(batch_id)
+        calls['pdf export'] = lambda: client.download_pdf(batch_id, pdf_path)
+    if args.upload:
+        calls['upload'] = lambda: client.upload_csv(args.upload)
+
+    print(f"{client.base_url}, {args.calls} calls each\n")
+    header = f"{'call':<20}{'pooled p50':>12}{'p95':>9}{'new conn p50':>15}{'p95':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, fn in calls.items():
+        fn()  # warm-up (and an error here stops the run)
+        pooled = time_calls(client, fn, args.calls, fresh_connections=False)
+        fresh = time_calls(client, fn, args.calls, fresh_connections=True)
+        print(f"{name:<20}{statistics.median(pooled) * 1000:>10.1f}ms{percentile(pooled, 95) * 1000:>7.1f}ms"
+              f"{statistics.median(fresh) * 1000:>13.1f}ms{percentile(fresh, 95) * 1000:>7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Local preview of the upload statistics, computed while the file is still uploading.
+
+compute_statistics() reads the CSV in chunks with pandas and builds the same
+"statistics" payload the server returns (backend core/ingest.py and the upload
+view): rows with a missing, non-numeric or non-finite reading are dropped, averages are
+rounded to 2 places and types are counted most common first. The dashboard
+shows it as provisional until the server's numbers arrive, then reports any
+difference found by compare_statistics().
+
+Uploads with an ingest profile (column mapping, unit conversion) can't be
+previewed this way: the desktop app uploads without one.
+"""
+import os
+
+REQUIRED_COLUMNS = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+
+# Rows parsed per chunk: bounds memory whatever the file size
+CHUNK_ROWS = 200_000
+
+# Averages are rounded to 2 places on both sides; allow one unit of rounding difference
+AVERAGE_TOLERANCE = 0.01
+
+
+def compute_statistics(file_path, progress=None, cancel=None):
+    """
+    The upload "statistics" payload of `file_path`, plus "rejected_rows".
+    `progress(bytes_read, bytes_total)` is called after each chunk; a set `cancel`
+    token stops at the next chunk. Raises ValueError if a required column is missing.
+    """
+    # Imported here: pandas is only needed once a file is picked
+    import numpy as np
+    import pandas as pd
+
+    total_bytes = os.path.getsize(file_path)
+    count = rejected = 0
+    sums = dict.fromkeys(NUMERIC_COLUMNS, 0.0)
+    type_counts = {}  # in order of first appearance, like the server's pd.factorize
+
+    with open(file_path, 'rb') as f:
+        header = pd.read_csv(f, nrows=0).columns
+        missing = [col for col in REQUIRED_COLUMNS if col not in header]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}. Required: {REQUIRED_COLUMNS}")
+        f.seek(0)
+
+        chunks = pd.read_csv(f, usecols=REQUIRED_COLUMNS, dtype={'Equipment Name': str, 'Type': str},
+                             chunksize=CHUNK_ROWS)
+        for chunk in chunks:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            for col in NUMERIC_COLUMNS:
+                if chunk[col].dtype.kind not in 'fi':
+                    # Some cell is not a number: the server rejects those rows
+                    chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+            bad = chunk[REQUIRED_COLUMNS].isna().any(axis=1) | ~np.isfinite(chunk[NUMERIC_COLUMNS]).all(axis=1)
+            valid = chunk[~bad]
+            rejected += len(chunk) - len(valid)
+            count += len(valid)
+            for col in NUMERIC_COLUMNS:
+                sums[col] += float(valid[col].sum())
+
+            codes, types = pd.factorize(valid['Type'])
+            for name, n in zip(types, np.bincount(codes, minlength=len(types))):
+                type_counts[name] = type_counts.get(name, 0) + int(n)
+
+            if progress is not None:
+                progress(f.tell(), total_bytes)
+
+    return {
+        "total_count": count,
+        "average_flowrate": round(sums['Flowrate'] / count, 2) if count else None,
+        "average_pressure": round(sums['Pressure'] / count, 2) if count else None,
+        "average_temperature": round(sums['Temperature'] / count, 2) if count else None,
+        # Most common first; ties keep their first-appearance order (sorted() is stable)
+        "type_distribution": dict(sorted(type_counts.items(), key=lambda item: -item[1])),
+        "rejected_rows": rejected,
+    }
+
+
+def compare_statistics(local, server):
+    """Differences between a local preview and the server's statistics, as readable lines (empty if they agree)."""
+    differences = []
+    if local.get("total_count") != server.get("total_count"):
+        differences.append(f"Total equipment: {local.get('total_count')} locally, {server.get('total_count')} on the server")
+
+    for key, label in (("average_flowrate", "Avg flowrate"), ("average_pressure", "Avg pressure"),
+                       ("average_temperature", "Avg temperature")):
+        mine, theirs = local.get(key), server.get(key)
+        if mine is None or theirs is None or abs(mine - theirs) > AVERAGE_TOLERANCE + 1e-9:
+            differences.append(f"{label}: {mine} locally, {theirs} on the server")
+
+    mine, theirs = local.get("type_distribution", {}), server.get("type_distribution", {})
+    for name in list(mine) + [name for name in theirs if name not in mine]:
+        if mine.get(name, 0) != theirs.get(name, 0):
+            differences.append(f"{name}: {mine.get(name, 0)} locally, {theirs.get(name, 0)} on the server")
+    return differences
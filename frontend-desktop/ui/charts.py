@@ -0,0 +1,175 @@
+"""
+Type distribution charts that update in place.
+
+Clearing the axes and re-plotting rebuilds every artist and re-lays out the
+figure on each stats change, which took seconds with hundreds of types. These
+charts keep their bars, wedges and labels between updates, change only their
+data, and ask for a redraw with draw_idle(), so several updates in a row (rapid
+clicks in the history list) paint once.
+
+Types past CHART_MAX_TYPES (environment, default 10) fold into a single "Other"
+bucket, so the charts stay readable whatever the number of types.
+
+Every matplotlib import lives here: the dashboard loads this module only when it
+first has a chart to show, which keeps matplotlib out of the app's startup.
+"""
+import math
+import os
+
+import matplotlib
+matplotlib.use('Qt5Agg')
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle, Wedge
+from PyQt5.QtWidgets import QSizePolicy
+
+from theme import Theme
+
+MAX_TYPES = int(os.getenv("CHART_MAX_TYPES", "10"))
+
+OTHER_LABEL = "Other"
+
+PALETTE = [
+    Theme.CHART_1, Theme.CHART_2, Theme.CHART_3, Theme.CHART_4, Theme.CHART_5,
+    Theme.CHART_6, Theme.CHART_7, Theme.CHART_8, Theme.CHART_9, Theme.CHART_10
+]
+
+# Slices thinner than this get no name or percentage (they would overlap; the bars show them)
+MIN_LABELLED_SHARE = 0.03
+
+
+class MplCanvas(FigureCanvas):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = self.fig.add_subplot(111)
+        
+        # Apply Theme
+        self.apply_theme()
+
+        super(MplCanvas, self).__init__(self.fig)
+        self.setParent(parent)
+        
+        SizePolicy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setSizePolicy(SizePolicy)
+
+    def apply_theme(self):
+        self.fig.patch.set_facecolor(Theme.CARD)
+        self.axes.set_facecolor(Theme.CARD)
+        
+        self.axes.tick_params(colors=Theme.FOREGROUND, which='both')
+        for spine in self.axes.spines.values():
+            spine.set_edgecolor(Theme.BORDER)
+            
+        self.axes.xaxis.label.set_color(Theme.FOREGROUND)
+        self.axes.yaxis.label.set_color(Theme.FOREGROUND)
+        self.axes.title.set_color(Theme.FOREGROUND)
+
+
+def fold_long_tail(type_dist, max_types=None):
+    """
+    The `max_types` - 1 most common types, plus "Other" summing the rest, when
+    there are more than `max_types`. Expects type_dist most common first (as the API sends it).
+    """
+    max_types = MAX_TYPES if max_types is None else max_types
+    items = list(type_dist.items())
+    if max_types < 2 or len(items) <= max_types:
+        return dict(items)
+    folded = dict(items[:max_types - 1])
+    folded[OTHER_LABEL] = folded.get(OTHER_LABEL, 0) + sum(count for _, count in items[max_types - 1:])
+    return folded
+
+
+class TypeBarChart:
+    """Count per type as bars on `canvas` (an MplCanvas)."""
+
+    BAR_WIDTH = 0.8
+
+    def __init__(self, canvas, max_types=None):
+        self.canvas = canvas
+        self.max_types = max_types
+        self.bars = []
+
+        axes = canvas.axes
+        axes.set_title("Count per Type", color=Theme.FOREGROUND, fontsize=12, fontweight='bold')
+        axes.tick_params(colors=Theme.FOREGROUND, labelcolor=Theme.FOREGROUND, axis='x', rotation=45)
+        axes.tick_params(colors=Theme.FOREGROUND, labelcolor=Theme.FOREGROUND, axis='y')
+        for spine in axes.spines.values():
+            spine.set_edgecolor(Theme.BORDER)
+        axes.patch.set_alpha(0)
+        canvas.fig.subplots_adjust(bottom=0.25)
+
+    def update(self, type_dist):
+        data = fold_long_tail(type_dist, self.max_types)
+        labels, values = list(data), list(data.values())
+        axes = self.canvas.axes
+
+        # Reuse the existing bars; add or remove only the difference
+        while len(self.bars) > len(values):
+            self.bars.pop().remove()
+        while len(self.bars) < len(values):
+            bar = Rectangle((0, 0), self.BAR_WIDTH, 0, color=Theme.CHART_1, alpha=0.9)
+            axes.add_patch(bar)
+            self.bars.append(bar)
+        for i, (bar, value) in enumerate(zip(self.bars, values)):
+            bar.set_x(i - self.BAR_WIDTH / 2)
+            bar.set_height(value)
+
+        axes.set_xticks(range(len(labels)), labels)
+        axes.set_xlim(-0.5, max(len(labels), 1) - 0.5)
+        axes.set_ylim(0, max(values, default=0) * 1.05 or 1)
+        self.canvas.draw_idle()
+
+
+class TypePieChart:
+    """Share of each type as a pie on `canvas` (an MplCanvas), laid out like Axes.pie."""
+
+    LABEL_DISTANCE = 1.1
+    PCT_DISTANCE = 0.6
+
+    def __init__(self, canvas, max_types=None):
+        self.canvas = canvas
+        self.max_types = max_types
+        self.slices = []  # (wedge, label, percentage) per slice
+
+        axes = canvas.axes
+        axes.set_title("Type Share", color=Theme.FOREGROUND, fontsize=12, fontweight='bold')
+        axes.set_aspect('equal')
+        axes.set_xlim(-1.25, 1.25)
+        axes.set_ylim(-1.25, 1.25)
+        axes.set_axis_off()
+
+    def update(self, type_dist):
+        data = fold_long_tail(type_dist, self.max_types)
+        total = sum(data.values())
+        axes = self.canvas.axes
+
+        while len(self.slices) > len(data):
+            for artist in self.slices.pop():
+                artist.remove()
+        while len(self.slices) < len(data):
+            wedge = Wedge((0, 0), 1, 0, 0, edgecolor=Theme.CARD, linewidth=1)
+            axes.add_patch(wedge)
+            label = axes.text(0, 0, "", color=Theme.FOREGROUND, fontsize=9, va='center')
+            percentage = axes.text(0, 0, "", color="#ffffff", fontweight='bold', ha='center', va='center')
+            self.slices.append((wedge, label, percentage))
+
+        # Counter-clockwise from 0°, as Axes.pie draws by default
+        start = 0.0
+        for i, ((name, count), (wedge, label, percentage)) in enumerate(zip(data.items(), self.slices)):
+            share = count / total if total else 0
+            end = start + share
+            wedge.set_theta1(360 * start)
+            wedge.set_theta2(360 * end)
+            wedge.set_facecolor(PALETTE[i % len(PALETTE)])
+
+            middle = 2 * math.pi * (start + end) / 2
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((self.LABEL_DISTANCE * x, self.LABEL_DISTANCE * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            percentage.set_position((self.PCT_DISTANCE * x, self.PCT_DISTANCE * y))
+            labelled = share >= MIN_LABELLED_SHARE
+            label.set_text(name if labelled else "")
+            percentage.set_text(f"{share * 100:.1f}%" if labelled else "")
+            start = end
+
+        self.canvas.draw_idle()
@@ -1,46 +1,16 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QFrame, 
     QSizePolicy, QFileDialog, QMessageBox, QScrollArea, QListWidget,
-    QListWidgetItem
+    QListWidgetItem, QLineEdit, QProgressBar
 )
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QColor, QFont
 
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import numpy as np
-
 from theme import Theme
 from ui.components import Card, ModernButton
 from api_client import APIClient
-
-class MplCanvas(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.fig.add_subplot(111)
-        
-        # Apply Theme
-        self.apply_theme()
-
-        super(MplCanvas, self).__init__(self.fig)
-        self.setParent(parent)
-        
-        SizePolicy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.setSizePolicy(SizePolicy)
-
-    def apply_theme(self):
-        self.fig.patch.set_facecolor(Theme.CARD)
-        self.axes.set_facecolor(Theme.CARD)
-        
-        self.axes.tick_params(colors=Theme.FOREGROUND, which='both')
-        for spine in self.axes.spines.values():
-            spine.set_edgecolor(Theme.BORDER)
-            
-        self.axes.xaxis.label.set_color(Theme.FOREGROUND)
-        self.axes.yaxis.label.set_color(Theme.FOREGROUND)
-        self.axes.title.set_color(Theme.FOREGROUND)
+from preview import compute_statistics, compare_statistics
+from workers import TaskRunner
 
 class Dashboard(QWidget):
     def __init__(self, parent=None, api_client=None):
@@ -50,6 +20,14 @@ class Dashboard(QWidget):
         self.stats = None
         self.batch_id = None  # Store batch_id for PDF export
         
+        # Every API call runs on this pool; results come back on the GUI thread
+        self.tasks = TaskRunner(self)
+        self.progress_channel = None  # Task shown in the progress row
+        
+        # Local statistics shown while an upload runs, and what they replaced
+        self.preview_stats = None
+        self._before_preview = None
+        
         # Main Layout (Scrollable)
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -70,6 +48,7 @@ class Dashboard(QWidget):
         self.setup_stats_section()
         self.setup_charts_section()
         self.setup_recent_uploads_section()
+        self.setup_equipment_history_section()
         
         self.layout.addStretch()
         self.scroll_area.setWidget(self.content_widget)
@@ -218,15 +197,50 @@ class Dashboard(QWidget):
         btn_container.addWidget(self.pdf_btn)
         btn_container.addStretch()
         
+        # Progress row for the running upload / export (hidden when idle)
+        self.progress_row = QWidget()
+        progress_layout = QHBoxLayout(self.progress_row)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_lbl = QLabel()
+        self.progress_lbl.setStyleSheet(f"color: {Theme.MUTED}; background: transparent;")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(8)
+        self.progress_bar.setStyleSheet(f"""
+            QProgressBar {{
+                background-color: {Theme.ACCENT};
+                border: none;
+                border-radius: 4px;
+            }}
+            QProgressBar::chunk {{
+                background-color: {Theme.PRIMARY};
+                border-radius: 4px;
+            }}
+        """)
+        self.cancel_btn = ModernButton("Cancel", is_primary=False)
+        self.cancel_btn.setFixedWidth(100)
+        self.cancel_btn.clicked.connect(self.cancel_progress_task)
+        progress_layout.addWidget(self.progress_lbl)
+        progress_layout.addWidget(self.progress_bar, 1)
+        progress_layout.addWidget(self.cancel_btn)
+        self.progress_row.setVisible(False)
+        
         layout.addWidget(icon_lbl)
         layout.addWidget(title_lbl)
         layout.addWidget(desc_lbl)
         layout.addSpacing(15)
         layout.addLayout(btn_container)
+        layout.addWidget(self.progress_row)
         
         self.layout.addWidget(self.upload_card)
 
     def setup_stats_section(self):
+        # Marks local preview numbers, then any mismatch with the server's (hidden otherwise)
+        self.stats_note_lbl = QLabel()
+        self.stats_note_lbl.setWordWrap(True)
+        self.stats_note_lbl.setVisible(False)
+        self.layout.addWidget(self.stats_note_lbl)
+        
         self.stats_container = QWidget()
         self.stats_layout = QHBoxLayout(self.stats_container)
         self.stats_layout.setContentsMargins(0, 0, 0, 0)
@@ -235,7 +249,7 @@ class Dashboard(QWidget):
         # Placeholders to be updated
         self.card_total = Card("Total Equipment", "—", "Units registered in system")
         self.card_flow = Card("Avg Flowrate", "—", "m³/hr average flow")
-        self.card_pressure = Card("Avg Pressure", "—", "Pa average pressure")
+        self.card_pressure = Card("Avg Pressure", "—", "bar average pressure")
         self.card_temp = Card("Avg Temperature", "—", "°C average temp")
         
         self.stats_layout.addWidget(self.card_total)
@@ -260,8 +274,7 @@ class Dashboard(QWidget):
         bar_header.setProperty("class", "CardTitle")
         bar_layout.addWidget(bar_header)
         
-        self.bar_canvas = MplCanvas(self, width=5, height=4)
-        bar_layout.addWidget(self.bar_canvas)
+        self.bar_layout = bar_layout
         
         # 2. Pie Chart (Share)
         pie_frame = QFrame()
@@ -271,8 +284,11 @@ class Dashboard(QWidget):
         pie_header.setProperty("class", "CardTitle")
         pie_layout.addWidget(pie_header)
         
-        self.pie_canvas = MplCanvas(self, width=5, height=4)
-        pie_layout.addWidget(self.pie_canvas)
+        self.pie_layout = pie_layout
+        
+        # The canvases are created with the first stats shown (see ensure_charts)
+        self.bar_chart = None
+        self.pie_chart = None
         
         charts_layout.addWidget(bar_frame)
         charts_layout.addWidget(pie_frame)
@@ -325,10 +341,73 @@ class Dashboard(QWidget):
         
         self.layout.addWidget(self.recent_uploads_frame)
 
+    def setup_equipment_history_section(self):
+        """Setup the section that charts one equipment's readings across batches."""
+        self.equipment_history_frame = QFrame()
+        self.equipment_history_frame.setProperty("class", "Card")
+        self.equipment_history_frame.setStyleSheet(f"""
+            QFrame[class="Card"] {{
+                background-color: {Theme.CARD};
+                border-radius: 8px;
+                border: 1px solid {Theme.BORDER};
+            }}
+        """)
+        
+        layout = QVBoxLayout(self.equipment_history_frame)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        header = QLabel("Equipment History")
+        header.setProperty("class", "CardTitle")
+        header.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {Theme.FOREGROUND}; background: transparent;")
+        layout.addWidget(header)
+        
+        # Search row: equipment name + button
+        search_row = QHBoxLayout()
+        self.equipment_name_input = QLineEdit()
+        self.equipment_name_input.setPlaceholderText("Equipment name, e.g. Pump-1")
+        self.equipment_name_input.setStyleSheet(f"""
+            QLineEdit {{
+                background-color: {Theme.INPUT};
+                color: {Theme.FOREGROUND};
+                border: 1px solid {Theme.BORDER};
+                border-radius: 6px;
+                padding: 8px 10px;
+            }}
+        """)
+        self.equipment_name_input.returnPressed.connect(self.load_equipment_history)
+        
+        self.equipment_history_btn = ModernButton("Show History", is_primary=False)
+        self.equipment_history_btn.setFixedWidth(140)
+        self.equipment_history_btn.clicked.connect(self.load_equipment_history)
+        
+        search_row.addWidget(self.equipment_name_input)
+        search_row.addWidget(self.equipment_history_btn)
+        layout.addLayout(search_row)
+        
+        # Created when the first equipment is loaded
+        self.equipment_history_canvas = None
+        self.equipment_history_layout = layout
+        
+        self.layout.addWidget(self.equipment_history_frame)
+
+    def load_equipment_history(self):
+        """Fetch and chart the history of the equipment named in the search box."""
+        equipment_name = self.equipment_name_input.text().strip()
+        if not equipment_name:
+            return
+        
+        self.tasks.submit(
+            'equipment_history', self.api_client.get_equipment_history, equipment_name,
+            on_result=self.plot_equipment_history,
+            on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to load equipment history:\n{str(e)}")
+        )
+
     def load_recent_uploads(self):
-        """Fetch and display recent uploads."""
+        """Fetch recent uploads in the background, then display them."""
+        self.tasks.submit('recent_uploads', self.api_client.get_recent_uploads, on_result=self.show_recent_uploads)
+
+    def show_recent_uploads(self, uploads):
         try:
-            uploads = self.api_client.get_recent_uploads()
             self.recent_uploads_list.clear()
             
             if not uploads:
@@ -358,6 +437,10 @@ class Dashboard(QWidget):
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.UserRole, batch_id)  # Store batch_id
                 self.recent_uploads_list.addItem(item)
+            
+            # Fetch every listed batch now, so that clicking one shows it at once
+            batch_ids = [upload.get('id') for upload in uploads if upload.get('id')]
+            self.tasks.submit('prefetch', self.api_client.prefetch_batch_stats, batch_ids, cancellable=True)
                 
         except Exception as e:
             print(f"Failed to load recent uploads: {e}")
@@ -369,15 +452,30 @@ class Dashboard(QWidget):
             self.load_batch_stats(batch_id)
 
     def load_batch_stats(self, batch_id):
-        """Load statistics for a specific batch."""
-        try:
-            data = self.api_client.get_batch_stats(batch_id)
-            self.batch_id = batch_id
-            self.stats = data.get("statistics", {})
-            self.update_ui_with_stats()
-            self.pdf_btn.setEnabled(True)
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to load batch data:\n{str(e)}")
+        """
+        Load statistics for a specific batch.
+        A newer click supersedes a request still in flight: only the last batch is shown.
+        """
+        cached = self.api_client.cached_batch_stats(batch_id)
+        if cached is not None:
+            # Already on disk: show it at once
+            self.tasks.cancel('batch_stats')
+            self.show_batch_stats(batch_id, cached)
+            return
+        
+        self.tasks.submit(
+            'batch_stats', self.api_client.get_batch_stats, batch_id,
+            on_result=lambda data: self.show_batch_stats(batch_id, data),
+            on_error=lambda e: QMessageBox.warning(self, "Error", f"Failed to load batch data:\n{str(e)}")
+        )
+
+    def show_batch_stats(self, batch_id, data):
+        # Another batch replaces a preview on screen (the upload result still shows when it arrives)
+        self.clear_preview()
+        self.batch_id = batch_id
+        self.stats = data.get("statistics", {})
+        self.update_ui_with_stats()
+        self.pdf_btn.setEnabled(not self.tasks.is_busy('pdf'))
 
     def browse_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Open CSV File", "", "CSV Files (*.csv)")
@@ -385,22 +483,112 @@ class Dashboard(QWidget):
             self.upload_file(file_path)
 
     def upload_file(self, file_path):
-        self.upload_btn.setText("Processing...")
+        self.upload_btn.setText("Uploading...")
         self.upload_btn.setEnabled(False)
+        self.show_progress('upload', "Uploading...")
+        self.clear_preview()
+        
+        self.tasks.submit(
+            'upload', self.api_client.upload_csv, file_path,
+            on_result=self.on_upload_finished,
+            on_error=self.on_upload_failed,
+            on_progress=self.on_upload_progress,
+            cancellable=True
+        )
+        # Meanwhile, compute the statistics locally to show them before the server answers
+        self.tasks.submit(
+            'preview', compute_statistics, file_path,
+            on_result=self.show_preview,
+            on_error=lambda e: print(f"Local preview failed: {e}"),
+            cancellable=True
+        )
+
+    def on_upload_progress(self, sent, total):
+        if sent < total:
+            self.update_progress(sent, total)
+            return
+        # Whole file sent: the server parses it before answering, which can't be cancelled
+        self.upload_btn.setText("Processing...")
+        self.show_progress('upload', "Processing on server...", cancellable=False)
+
+    def on_upload_finished(self, data):
+        preview_stats = self.preview_stats
+        self.end_upload()
+        # The upload supersedes a batch click still loading
+        self.tasks.cancel('batch_stats')
+        self.clear_preview()
+        self.batch_id = data.get("batch_id")
+        self.stats = data.get("statistics", {})
+        self.update_ui_with_stats()
+        self.pdf_btn.setEnabled(not self.tasks.is_busy('pdf'))
+        self.load_recent_uploads()  # Refresh recent uploads
+        
+        # The server's numbers replace the preview: say so if they differ
+        differences = compare_statistics(preview_stats, self.stats) if preview_stats else []
+        if differences:
+            self.show_stats_note("The server's results differ from the local preview:\n" + "\n".join(differences),
+                                 Theme.DESTRUCTIVE)
+            QMessageBox.warning(self, "Preview Mismatch",
+                                "File uploaded, but the server's statistics differ from the local preview:\n\n"
+                                + "\n".join(differences))
+        else:
+            QMessageBox.information(self, "Success", "File uploaded and processed successfully!")
+
+    def on_upload_failed(self, error):
+        self.end_upload()
+        self.discard_preview()
+        QMessageBox.critical(self, "Error", f"Failed to upload file:\n{str(error)}")
+
+    def end_upload(self):
+        self.hide_progress('upload')
+        self.tasks.cancel('preview')
+        self.upload_btn.setText("Upload CSV")
+        self.upload_btn.setEnabled(True)
+
+    def show_preview(self, stats):
+        """Show locally computed statistics as provisional while the upload runs."""
+        if not self.tasks.is_busy('upload') or not stats.get("total_count"):
+            return
+        self.preview_stats = stats
+        self._before_preview = (self.batch_id, self.stats)
+        # The batch doesn't exist on the server yet: nothing to export
+        self.batch_id = None
+        self.stats = stats
+        self.update_ui_with_stats()
+        self.pdf_btn.setEnabled(False)
         
-        try:
-            data = self.api_client.upload_csv(file_path)
-            self.batch_id = data.get("batch_id")
-            self.stats = data.get("statistics", {})
+        note = f"Preview computed locally from {stats['total_count']} rows"
+        if stats.get("rejected_rows"):
+            note += f" ({stats['rejected_rows']} rejected)"
+        self.show_stats_note(note + ". The server's results will replace it.", Theme.MUTED)
+
+    def clear_preview(self):
+        """Forget the preview; whatever is shown now stays."""
+        self.tasks.cancel('preview')
+        self.preview_stats = None
+        self._before_preview = None
+        self.stats_note_lbl.setVisible(False)
+
+    def discard_preview(self):
+        """The upload didn't go through: put back what the preview replaced."""
+        before = self._before_preview
+        self.clear_preview()
+        if before is None:
+            return
+        self.batch_id, self.stats = before
+        if self.stats:
             self.update_ui_with_stats()
-            self.pdf_btn.setEnabled(True)
-            self.load_recent_uploads()  # Refresh recent uploads
-            QMessageBox.information(self, "Success", "File uploaded and processed successfully!")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to upload file:\n{str(e)}")
-        finally:
-            self.upload_btn.setText("Upload CSV")
-            self.upload_btn.setEnabled(True)
+        else:
+            self.hero_count_lbl.setText("—")
+            self.hero_types_lbl.setText("—")
+            self.stats_container.setVisible(False)
+            self.charts_container.setVisible(False)
+        self.pdf_btn.setEnabled(self.batch_id is not None and not self.tasks.is_busy('pdf'))
+
+    def show_stats_note(self, text, color):
+        self.stats_note_lbl.setText(text)
+        self.stats_note_lbl.setStyleSheet(f"color: {color}; background: transparent;")
+        self.stats_note_lbl.setVisible(True)
 
     def download_pdf(self):
         """Download PDF report for the current batch."""
@@ -421,15 +609,60 @@ class Dashboard(QWidget):
         
         self.pdf_btn.setText("Exporting...")
         self.pdf_btn.setEnabled(False)
-        
-        try:
-            self.api_client.download_pdf(self.batch_id, save_path)
-            QMessageBox.information(self, "Success", f"PDF report saved to:\n{save_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to download PDF:\n{str(e)}")
-        finally:
-            self.pdf_btn.setText("Export PDF")
-            self.pdf_btn.setEnabled(True)
+        self.show_progress('pdf', "Downloading PDF...")
+        
+        self.tasks.submit(
+            'pdf', self.api_client.download_pdf, self.batch_id, save_path,
+            on_result=lambda _: self.on_pdf_finished(save_path),
+            on_error=self.on_pdf_failed,
+            on_progress=self.update_progress,
+            cancellable=True
+        )
+
+    def on_pdf_finished(self, save_path):
+        self.end_pdf_export()
+        QMessageBox.information(self, "Success", f"PDF report saved to:\n{save_path}")
+
+    def on_pdf_failed(self, error):
+        self.end_pdf_export()
+        QMessageBox.critical(self, "Error", f"Failed to download PDF:\n{str(error)}")
+
+    def end_pdf_export(self):
+        self.hide_progress('pdf')
+        self.pdf_btn.setText("Export PDF")
+        self.pdf_btn.setEnabled(self.batch_id is not None)
+
+    def show_progress(self, channel, text, cancellable=True):
+        """Show the progress row for the task on `channel` (indeterminate until it reports)."""
+        self.progress_channel = channel
+        self.progress_lbl.setText(text)
+        self.progress_bar.setRange(0, 0)
+        self.cancel_btn.setVisible(cancellable)
+        self.progress_row.setVisible(True)
+
+    def update_progress(self, done, total):
+        if total:
+            # Per mille: byte counts of large files overflow the bar's int range
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(done * 1000 / total))
+
+    def hide_progress(self, channel):
+        if self.progress_channel == channel:
+            self.progress_channel = None
+            self.progress_row.setVisible(False)
+
+    def cancel_progress_task(self):
+        channel = self.progress_channel
+        self.tasks.cancel(channel)
+        if channel == 'pdf':
+            self.end_pdf_export()
+        elif channel == 'upload':
+            self.end_upload()
+            self.discard_preview()
+
+    def shutdown(self):
+        """Stop background requests (the window is closing)."""
+        self.tasks.shutdown()
 
     def update_ui_with_stats(self):
         if not self.stats:
@@ -451,62 +684,62 @@ class Dashboard(QWidget):
         self.stats_container.setVisible(True)
         self.charts_container.setVisible(True)
         
-        # 3. Charts
-        self.plot_bar_chart(type_dist)
-        self.plot_pie_chart(type_dist)
+        # 3. Charts (updated in place, painted on the next idle cycle)
+        self.ensure_charts()
+        self.bar_chart.update(type_dist)
+        self.pie_chart.update(type_dist)
 
-    def plot_bar_chart(self, type_dist):
-        labels = list(type_dist.keys())
-        values = list(type_dist.values())
-        
-        self.bar_canvas.axes.clear()
-        
-        TEXT_COLOR = Theme.FOREGROUND 
-        
-        self.bar_canvas.axes.bar(labels, values, color=Theme.CHART_1, alpha=0.9)
-        self.bar_canvas.axes.set_title("Count per Type", color=TEXT_COLOR, fontsize=12, fontweight='bold')
-        self.bar_canvas.axes.tick_params(colors=TEXT_COLOR, labelcolor=TEXT_COLOR, axis='x', rotation=45)
-        self.bar_canvas.axes.tick_params(colors=TEXT_COLOR, labelcolor=TEXT_COLOR, axis='y')
+    def ensure_charts(self):
+        """Create the type charts, loading matplotlib, the first time there is data for them."""
+        if self.bar_chart is not None:
+            return
+        from ui.charts import MplCanvas, TypeBarChart, TypePieChart
         
-        # Style spines
-        for spine in self.bar_canvas.axes.spines.values():
-            spine.set_edgecolor(Theme.BORDER)
-            
-        self.bar_canvas.axes.patch.set_alpha(0)
-        self.bar_canvas.fig.subplots_adjust(bottom=0.25)
+        self.bar_canvas = MplCanvas(self, width=5, height=4)
+        self.bar_chart = TypeBarChart(self.bar_canvas)
+        self.bar_layout.addWidget(self.bar_canvas)
         
-        self.bar_canvas.draw()
+        self.pie_canvas = MplCanvas(self, width=5, height=4)
+        self.pie_chart = TypePieChart(self.pie_canvas)
+        self.pie_layout.addWidget(self.pie_canvas)
 
-    def plot_pie_chart(self, type_dist):
-        labels = list(type_dist.keys())
-        values = list(type_dist.values())
-        
-        # React-matching color palette
-        colors = [
-            Theme.CHART_1, Theme.CHART_2, Theme.CHART_3, Theme.CHART_4, Theme.CHART_5,
-            Theme.CHART_6, Theme.CHART_7, Theme.CHART_8, Theme.CHART_9, Theme.CHART_10
+    def plot_equipment_history(self, data):
+        history = data.get("history", [])
+        
+        # One point per batch, labelled by upload date
+        x = list(range(len(history)))
+        labels = [str(point.get("uploaded_at", ""))[:10] for point in history]
+        series = [
+            ("flowrate", "Flowrate (m³/hr)", Theme.CHART_1),
+            ("pressure", "Pressure (bar)", Theme.CHART_2),
+            ("temperature", "Temperature (°C)", Theme.CHART_4),
         ]
         
-        color_map = [colors[i % len(colors)] for i in range(len(values))]
-        
-        self.pie_canvas.axes.clear()
-        
         TEXT_COLOR = Theme.FOREGROUND
         
-        wedges, texts, autotexts = self.pie_canvas.axes.pie(
-            values, labels=labels, autopct='%1.1f%%',
-            colors=color_map,
-            textprops={'color': TEXT_COLOR},
-            wedgeprops={'edgecolor': Theme.CARD, 'linewidth': 1}
-        )
-        
-        for text in texts:
-            text.set_color(TEXT_COLOR)
-            text.set_fontsize(9)
-            
-        for autotext in autotexts:
-            autotext.set_color("#ffffff")
-            autotext.set_fontweight('bold')
-        
-        self.pie_canvas.axes.set_title("Type Share", color=TEXT_COLOR, fontsize=12, fontweight='bold')
-        self.pie_canvas.draw()
+        if self.equipment_history_canvas is None:
+            from ui.charts import MplCanvas
+            self.equipment_history_canvas = MplCanvas(self, width=8, height=5)
+            self.equipment_history_canvas.setMinimumHeight(360)
+            self.equipment_history_layout.addWidget(self.equipment_history_canvas)
+        
+        # Three stacked axes sharing the batch axis, since the units differ
+        fig = self.equipment_history_canvas.fig
+        fig.clear()
+        axes_list = fig.subplots(len(series), 1, sharex=True)
+        
+        for axes, (key, label, color) in zip(axes_list, series):
+            axes.plot(x, [point.get(key) for point in history], color=color, marker='o', linewidth=2)
+            axes.set_ylabel(label, color=TEXT_COLOR, fontsize=8)
+            axes.tick_params(colors=TEXT_COLOR, labelcolor=TEXT_COLOR)
+            axes.set_facecolor(Theme.CARD)
+            for spine in axes.spines.values():
+                spine.set_edgecolor(Theme.BORDER)
+        
+        axes_list[0].set_title(data.get("equipment_name", ""), color=TEXT_COLOR, fontsize=12, fontweight='bold')
+        axes_list[-1].set_xticks(x)
+        axes_list[-1].set_xticklabels(labels, rotation=45, fontsize=8)
+        fig.subplots_adjust(bottom=0.18, left=0.15, hspace=0.3)
+        
+        self.equipment_history_canvas.setVisible(True)
+        self.equipment_history_canvas.draw()
@@ -5,6 +5,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QPalette, QColor
 from theme import Theme
+from workers import TaskRunner
 
 
 class LoginDialog(QDialog):
@@ -14,6 +15,7 @@ class LoginDialog(QDialog):
         super().__init__(parent)
         self.api_client = api_client
         self.authenticated = False
+        self.tasks = TaskRunner(self, max_threads=1)
         
         self.setWindowTitle("Login - Chemical Equipment Analytics Dashboard")
         self.setFixedSize(440, 500)
@@ -168,21 +170,33 @@ class LoginDialog(QDialog):
         self.login_btn.setText("Logging in...")
         self.login_btn.setEnabled(False)
         
-        try:
-            self.api_client.set_credentials(username, password)
-            
-            if self.api_client.test_auth():
-                self.authenticated = True
-                self.accept()
-            else:
-                QMessageBox.critical(self, "Login Failed", "Invalid username or password.")
-                self.api_client.clear_credentials()
-        except Exception as e:
-            QMessageBox.critical(self, "Connection Error", f"Could not connect to server:\n{str(e)}")
+        # Checked in the background so the dialog stays responsive
+        self.api_client.set_credentials(username, password)
+        self.tasks.submit('login', self.api_client.test_auth,
+                          on_result=self.on_auth_checked, on_error=self.on_auth_error)
+    
+    def on_auth_checked(self, valid):
+        self.reset_login_button()
+        if valid:
+            self.authenticated = True
+            self.accept()
+        else:
+            QMessageBox.critical(self, "Login Failed", "Invalid username or password.")
             self.api_client.clear_credentials()
-        finally:
-            self.login_btn.setText("Login")
-            self.login_btn.setEnabled(True)
+    
+    def on_auth_error(self, error):
+        self.reset_login_button()
+        QMessageBox.critical(self, "Connection Error", f"Could not connect to server:\n{str(error)}")
+        self.api_client.clear_credentials()
+    
+    def reset_login_button(self):
+        self.login_btn.setText("Login")
+        self.login_btn.setEnabled(True)
+    
+    def done(self, result):
+        # Closing the dialog drops a login check still in flight
+        self.tasks.cancel_all()
+        super().done(result)
     
     def get_credentials(self):
         return (self.username_input.text().strip(), self.password_input.text())
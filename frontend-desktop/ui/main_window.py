@@ -2,13 +2,31 @@ from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
     QStackedWidget, QLabel, QFrame, QPushButton, QMessageBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+import importlib
+import threading
 from theme import Theme
-from ui.dashboard import Dashboard
 from ui.components import SidebarButton
 from ui.login_dialog import LoginDialog
 from api_client import APIClient
 
+# Loaded in the background while the login dialog waits for input: the bulk of the
+# dashboard's import time, and nothing that touches Qt. The dashboard itself and
+# matplotlib's Qt backend (ui.charts) are imported on the GUI thread, when the
+# dashboard is built.
+DEFERRED_MODULES = ['numpy', 'pandas', 'matplotlib.figure', 'matplotlib.patches']
+
+
+def preload_modules(names):
+    """
+    Import `names` on a background thread; a later import of one just picks it up (or waits for it).
+    Only for modules that don't use Qt: Qt GUI code must be imported on the GUI thread.
+    """
+    def load():
+        for name in names:
+            importlib.import_module(name)
+    threading.Thread(target=load, name='preload', daemon=True).start()
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -46,17 +64,27 @@ class MainWindow(QMainWindow):
         # Only show login dialog on first show
         if not hasattr(self, '_login_shown'):
             self._login_shown = True
-            # Use a single-shot timer to show dialog after window is visible
-            from PyQt5.QtCore import QTimer
-            QTimer.singleShot(100, self.show_login_dialog)
+            # Use a single-shot timer to show dialog as soon as the window is visible
+            QTimer.singleShot(0, self.show_login_dialog)
+    
+    def closeEvent(self, event):
+        """Stop the dashboard's background requests before closing."""
+        if self.view_dashboard is not None:
+            self.view_dashboard.shutdown()
+        super().closeEvent(event)
     
     def show_login_dialog(self):
         """Display login dialog and initialize dashboard on success."""
         login_dialog = LoginDialog(self.api_client, self)
+        # The user is typing credentials meanwhile
+        QTimer.singleShot(0, lambda: preload_modules(DEFERRED_MODULES))
         result = login_dialog.exec_()
         
         if result == LoginDialog.Accepted and login_dialog.authenticated:
-            # Login successful - create and show dashboard
+            # Login successful - create and show dashboard. Both imports run here, on the
+            # GUI thread: ui.charts selects and loads matplotlib's Qt5Agg backend.
+            from ui.dashboard import Dashboard
+            import ui.charts  # noqa: F401
             self.view_dashboard = Dashboard(api_client=self.api_client)
             self.content_layout.addWidget(self.view_dashboard)
         else:
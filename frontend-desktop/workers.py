@@ -0,0 +1,147 @@
+"""
+Background execution of APIClient calls, so the Qt GUI thread never blocks on the network.
+
+A TaskRunner runs callables on its own QThreadPool and delivers their result,
+error and progress back on the GUI thread. Tasks are submitted on a named
+channel ("upload", "batch_stats", ...): a new task cancels the one still
+pending on the same channel, so only the latest request's result is ever
+shown (rapid clicks in the history list don't pile up).
+
+Cancelling a task that has not started removes it from the pool. A running
+task gets its CancelToken set; functions that accept `cancel=` stop at their
+next check (raising RequestCancelled), and the result of any cancelled task
+is dropped.
+"""
+import itertools
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from cancellation import CancelToken, RequestCancelled
+
+# Progress callbacks are rate-limited to this many per second (plus the final one)
+PROGRESS_UPDATES_PER_SECOND = 20
+
+
+class _TaskSignals(QObject):
+    # (task id, payload); emitted from worker threads, received on the GUI thread
+    succeeded = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+    progress = pyqtSignal(int, object, object)
+
+
+class _Task(QRunnable):
+
+    def __init__(self, task_id, channel, fn, args, kwargs, signals, on_result, on_error, on_progress):
+        super().__init__()
+        self.setAutoDelete(False)  # the runner keeps it until its result is delivered
+        self.task_id = task_id
+        self.channel = channel
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.signals = signals
+        self.on_result, self.on_error, self.on_progress = on_result, on_error, on_progress
+        self.token = CancelToken()
+        self._last_progress = 0.0
+
+    def report_progress(self, done, total):
+        # Called from the worker thread, possibly for every chunk
+        now = time.monotonic()
+        if (total is not None and done >= total) or now - self._last_progress >= 1 / PROGRESS_UPDATES_PER_SECOND:
+            self._last_progress = now
+            self.signals.progress.emit(self.task_id, done, total)
+
+    def run(self):
+        try:
+            # Cancelled after a worker thread picked it up (too late for tryTake):
+            # still report back, so the runner drops the task
+            self.token.raise_if_cancelled()
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.task_id, e)
+        else:
+            self.signals.succeeded.emit(self.task_id, result)
+
+
+class TaskRunner(QObject):
+    """Runs API calls off the GUI thread, one pending task per channel."""
+
+    def __init__(self, parent=None, max_threads=4):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._tasks = {}      # task id -> _Task, until its outcome is delivered
+        self._channels = {}   # channel -> id of its latest task
+        self._signals = _TaskSignals(self)
+        self._signals.succeeded.connect(self._on_succeeded)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.progress.connect(self._on_progress)
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, on_progress=None,
+               cancellable=False, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the pool, cancelling the previous task of `channel`.
+        `on_result(result)` / `on_error(exception)` / `on_progress(done, total)` are
+        called on the GUI thread. With `on_progress`, fn receives a `progress`
+        callback; with `cancellable`, a `cancel` CancelToken.
+        """
+        self.cancel(channel)
+        task_id = next(self._ids)
+        task = _Task(task_id, channel, fn, args, kwargs, self._signals, on_result, on_error, on_progress)
+        if on_progress is not None:
+            task.kwargs['progress'] = task.report_progress
+        if cancellable:
+            task.kwargs['cancel'] = task.token
+        self._tasks[task_id] = task
+        self._channels[channel] = task_id
+        self.pool.start(task)
+        return task_id
+
+    def cancel(self, channel):
+        """Cancel the pending task of `channel`, if any; its outcome won't be delivered."""
+        task = self._tasks.get(self._channels.pop(channel, None))
+        if task is None:
+            return
+        task.token.cancel()
+        if self.pool.tryTake(task):
+            # Not started yet: it never will
+            del self._tasks[task.task_id]
+
+    def cancel_all(self):
+        for channel in list(self._channels):
+            self.cancel(channel)
+
+    def is_busy(self, channel):
+        return channel in self._channels
+
+    def shutdown(self, timeout_ms=2000):
+        """Cancel everything and wait (briefly) for running calls to return."""
+        self.cancel_all()
+        self.pool.waitForDone(timeout_ms)
+
+    def _finish(self, task_id):
+        """The task if its outcome should be delivered, else None (cancelled or superseded)."""
+        task = self._tasks.pop(task_id, None)
+        if task is None or task.token.cancelled:
+            return None
+        if self._channels.get(task.channel) == task_id:
+            del self._channels[task.channel]
+        return task
+
+    @pyqtSlot(int, object)
+    def _on_succeeded(self, task_id, result):
+        task = self._finish(task_id)
+        if task is not None and task.on_result is not None:
+            task.on_result(result)
+
+    @pyqtSlot(int, object)
+    def _on_failed(self, task_id, error):
+        task = self._finish(task_id)
+        if task is not None and task.on_error is not None and not isinstance(error, RequestCancelled):
+            task.on_error(error)
+
+    @pyqtSlot(int, object, object)
+    def _on_progress(self, task_id, done, total):
+        task = self._tasks.get(task_id)
+        if task is not None and not task.token.cancelled and task.on_progress is not None:
+            task.on_progress(done, total)
@@ -90,6 +90,26 @@ const Dashboard = ({ authHeader, onLogout, darkMode, toggleDarkMode }) => {
         }
     };
 
+    // The export endpoint requires auth, so fetch the PDF with the header and save the blob
+    const handleExportPdf = async () => {
+        if (!batchId) return;
+        try {
+            const response = await axios.get(`${API_BASE}/api/export-pdf/${batchId}/`, {
+                headers: { 'Authorization': authHeader },
+                responseType: 'blob'
+            });
+            const url = URL.createObjectURL(response.data);
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = `batch_${batchId}_report.pdf`;
+            link.click();
+            URL.revokeObjectURL(url);
+        } catch (err) {
+            setError('Failed to export PDF.');
+            if (err.response?.status === 401) onLogout();
+        }
+    };
+
     const handleBatchSelect = async (id) => {
         setLoading(true);
         setError('');
@@ -168,7 +188,7 @@ const Dashboard = ({ authHeader, onLogout, darkMode, toggleDarkMode }) => {
                     {/* Desktop Nav Buttons */}
                     <div className="hidden sm:flex items-center gap-3">
                         <Button
-                            onClick={() => batchId && window.open(`${API_BASE}/api/export-pdf/${batchId}/`, '_blank')}
+                            onClick={handleExportPdf}
                             size="sm"
                             disabled={!batchId}
                             className="bg-primary hover:bg-primary/90 text-primary-foreground"
@@ -220,7 +240,7 @@ const Dashboard = ({ authHeader, onLogout, darkMode, toggleDarkMode }) => {
                     <div className="sm:hidden border-t border-border bg-background p-3 space-y-2 animate-in slide-in-from-top-2">
                         <Button
                             onClick={() => {
-                                batchId && window.open(`${API_BASE}/api/export-pdf/${batchId}/`, '_blank');
+                                handleExportPdf();
                                 setMobileMenuOpen(false);
                             }}
                             size="sm"
@@ -369,7 +389,7 @@ const Dashboard = ({ authHeader, onLogout, darkMode, toggleDarkMode }) => {
                                 </CardHeader>
                                 <CardContent className="p-3 sm:p-6 pt-0">
                                     <div className="text-2xl sm:text-3xl font-bold tracking-tight">{stats.average_pressure}</div>
-                                    <p className="text-[10px] sm:text-xs text-muted-foreground mt-1 font-medium">Pa avg pressure</p>
+                                    <p className="text-[10px] sm:text-xs text-muted-foreground mt-1 font-medium">bar avg pressure</p>
                                 </CardContent>
                             </Card>
 